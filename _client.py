@@ -0,0 +1,8 @@
+"""
+Shared HTTP client for the API test scripts
+One keep-alive session so consecutive calls reuse the same connection
+"""
+
+import requests
+
+session = requests.Session()
@@ -1,12 +1,32 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from datetime import datetime
+from decimal import Decimal
 import os
+import atexit
+import logging
+import logging.handlers
+import queue
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging once for the whole app (route modules only create loggers).
+# Request threads only enqueue records; a listener thread formats and writes them,
+# so concurrent requests never contend on the stdout lock
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # full format applied by the listener
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), handlers=[_log_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # Import blueprints
 from routes.auth import auth_bp
 from routes.meetings import meetings_bp
@@ -15,13 +35,39 @@ from routes.upload import upload_bp
 from routes.health import health_bp
 
 # Import database initialization
-from config.database import init_db
+from config.database import init_db, start_meeting_stats_refresher
 
 # Import middleware
 from middleware.rate_limiting import limiter
 
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively (mirrors Flask's default provider)"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (native datetime/UUID, no str round-trip)"""
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_orjson_default, option=self.option),
+            mimetype='application/json'
+        )
+
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Configure CORS for all origins on API routes
     # This allows the React frontend to call APIs without CORS issues
@@ -45,6 +91,7 @@ def create_app():
     
     # Initialize database
     init_db()
+    start_meeting_stats_refresher()
     
     # Initialize rate limiter
     limiter.init_app(app)
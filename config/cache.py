@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry"""
+
+    def __init__(self, default_timeout=30, max_entries=10000):
+        self.default_timeout = default_timeout
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, timeout=None):
+        """Store value under key for `timeout` seconds (default_timeout if omitted)"""
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries[key] = (time.monotonic() + timeout, value)
+
+    def delete(self, key):
+        """Remove key if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        """Remove every key starting with prefix"""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        """Drop expired entries, then the oldest one if still full (lock must be held)"""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at < now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+# Global cache instance
+cache = TTLCache(
+    default_timeout=int(os.getenv('CACHE_DEFAULT_TIMEOUT', 30)),
+    max_entries=int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+)
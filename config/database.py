@@ -1,23 +1,79 @@
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import AsIs
+from psycopg2.extras import RealDictCursor, execute_values
+import io
 import os
+import time
 import threading
 from contextlib import contextmanager
 
+def _copy_csv_value(value):
+    """Render one value as a COPY CSV field (unquoted empty field means NULL)"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        # Postgres array literal, e.g. {"a","b"}
+        value = '{' + ','.join(
+            '"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"' for item in value
+        ) + '}'
+    return '"' + str(value).replace('"', '""') + '"'
+
+class StatementBatch:
+    """Write statements queued inside db.pipeline(); sent together when the block exits"""
+    
+    def __init__(self):
+        self.statements = []
+    
+    def execute_query(self, query, params=None):
+        """Queue a statement (no results are returned)"""
+        self.statements.append((query, params, None))
+    
+    def execute_values(self, query, params_list, template=None):
+        """Queue a "VALUES %s" statement, same contract as Database.execute_values"""
+        if params_list:
+            template = template or '(' + ','.join(['%s'] * len(params_list[0])) + ')'
+            self.statements.append((query, params_list, template))
+    
+    def render(self, cursor):
+        """Bind every queued statement client-side and join them into one SQL string"""
+        rendered = []
+        for query, params, template in self.statements:
+            if template is not None:
+                values = b','.join(cursor.mogrify(template, row) for row in params)
+                rendered.append(cursor.mogrify(query, (AsIs(values.decode('utf-8')),)))
+            else:
+                rendered.append(cursor.mogrify(query, params))
+        return b';\n'.join(rendered)
+
 class Database:
     def __init__(self):
         self.connection_string = os.getenv('NEON_DATABASE_URL')
         if not self.connection_string:
             raise ValueError("NEON_DATABASE_URL environment variable is required")
         
-        # Connection pool configuration
-        self.min_connections = int(os.getenv('DB_MIN_CONNECTIONS', 1))
+        # Connection pool configuration. A few warm connections are opened up front so
+        # the first requests after boot skip the TCP/TLS/auth handshake; the ceiling
+        # should cover every gunicorn thread plus background workers so none of them
+        # falls back to a one-off connection.
         self.max_connections = int(os.getenv('DB_MAX_CONNECTIONS', 20))
+        self.min_connections = min(int(os.getenv('DB_MIN_CONNECTIONS', 4)), self.max_connections)
+        concurrent_users = (int(os.getenv('GUNICORN_THREADS', 8)) + int(os.getenv('BACKGROUND_WORKERS', 4))
+                            + int(os.getenv('PIPELINE_WORKERS', 2)))
+        if self.max_connections < concurrent_users:
+            print(f"[WARNING] DB_MAX_CONNECTIONS={self.max_connections} is below GUNICORN_THREADS + "
+                  f"BACKGROUND_WORKERS + PIPELINE_WORKERS ({concurrent_users}); "
+                  f"threads may fall back to direct connections")
         
         # Initialize connection pool
         self._pool = None
         self._pool_lock = threading.Lock()
+        # Connection pinned to the current thread by session(), if any
+        self._session = threading.local()
         self._initialize_pool()
     
     def _initialize_pool(self):
@@ -55,16 +111,51 @@ class Database:
         """Return connection to pool"""
         try:
             if self._pool and conn:
-                self._pool.putconn(conn)
+                self._pool.putconn(conn, close=bool(conn.closed))
         except Exception as e:
             print(f"[ERROR] Failed to return connection to pool: {e}")
             # If pool return fails, close connection directly
             if conn:
                 conn.close()
     
+    @contextmanager
+    def session(self):
+        """
+        Pin one pooled connection to the current thread for the duration of the block
+        Every db call made by this thread inside the block reuses it instead of
+        checking a connection out of the pool per statement. Nested sessions share it.
+        """
+        if getattr(self._session, 'conn', None) is not None:
+            yield
+            return
+        self._session.conn = self._get_connection_from_pool()
+        try:
+            yield
+        finally:
+            conn, self._session.conn = self._session.conn, None
+            self._return_connection_to_pool(conn)
+    
+    def _session_connection(self):
+        """Return this thread's session connection (replaced once psycopg2 has marked it closed), or None"""
+        conn = getattr(self._session, 'conn', None)
+        if conn is not None and conn.closed:
+            self._return_connection_to_pool(conn)
+            conn = self._session.conn = self._get_connection_from_pool()
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """Context manager for database connections with connection pooling"""
+        session_conn = self._session_connection()
+        if session_conn is not None:
+            try:
+                yield session_conn
+            except Exception:
+                if not session_conn.closed:
+                    session_conn.rollback()
+                raise
+            return
+        
         conn = None
         try:
             conn = self._get_connection_from_pool()
@@ -78,15 +169,20 @@ class Database:
                 self._return_connection_to_pool(conn)
     
     def execute_query(self, query, params=None):
-        """Execute a query and return results"""
+        """
+        Execute a query and return results
+        Statements that produce rows (SELECT, ... RETURNING, WITH) return the fetched rows;
+        anything else returns the affected row count. Non-SELECT statements are committed.
+        """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(query, params)
-                    if query.strip().upper().startswith('SELECT'):
-                        return cursor.fetchall()
-                    conn.commit()
-                    return cursor.rowcount
+                    is_select = query.lstrip()[:6].upper() == 'SELECT'
+                    result = cursor.fetchall() if cursor.description is not None else cursor.rowcount
+                    if not is_select:
+                        conn.commit()
+                    return result
         except psycopg2.Error as e:
             print(f"[ERROR] Database error: {e}")
             print(f"[ERROR] Query: {query}")
@@ -106,6 +202,59 @@ class Database:
                 conn.commit()
                 return cursor.rowcount
     
+    def execute_values(self, query, params_list, template=None, page_size=1000):
+        """
+        Write many rows with a single multi-row statement
+        query must contain one bare "VALUES %s" placeholder, e.g.
+        "INSERT INTO t (a, b) VALUES %s"; up to page_size rows go in each round-trip.
+        template optionally sets the per-row snippet, e.g. "(%s::uuid, %s)".
+        """
+        if not params_list:
+            return 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                execute_values(cursor, query, params_list, template=template, page_size=page_size)
+                conn.commit()
+                return len(params_list)
+    
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue write statements and send them in a single round-trip and transaction
+        Usage: with db.pipeline() as batch: batch.execute_query(...); batch.execute_values(...)
+        Nothing is sent if the block raises.
+        """
+        batch = StatementBatch()
+        yield batch
+        if not batch.statements:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(batch.render(cursor))
+                conn.commit()
+    
+    def copy_records(self, table, columns, rows):
+        """Bulk-load rows into table with COPY FROM STDIN (CSV); returns the row count"""
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(','.join(_copy_csv_value(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+                conn.commit()
+                return cursor.rowcount
+    
+    def bulk_insert(self, table, columns, rows, copy_threshold=10):
+        """Insert rows with a multi-row VALUES statement, or COPY for larger batches"""
+        if not rows:
+            return 0
+        if len(rows) >= copy_threshold:
+            return self.copy_records(table, columns, rows)
+        return self.execute_values(f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s", rows)
+    
     def get_pool_status(self):
         """Get connection pool status for monitoring"""
         try:
@@ -252,6 +401,102 @@ def init_db():
     );
     """
     
+    # Task indexes matching the tasks endpoints' filters and ORDER BY
+    # (deadline ASC NULLS LAST, created_at DESC); the partial index serves the
+    # upcoming/overdue/due-this-week lookups, which only touch open tasks
+    create_tasks_indexes = """
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_deadline
+        ON tasks (user_id, deadline ASC NULLS LAST, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_status ON tasks (user_id, status);
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_priority ON tasks (user_id, priority);
+    CREATE INDEX IF NOT EXISTS idx_tasks_meeting ON tasks (meeting_id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_user_open_deadline
+        ON tasks (user_id, deadline) WHERE status <> 'completed';
+    """
+    
+    # Per-user task version, bumped by statement-level triggers on every task
+    # insert/update/delete (including cascades and bulk COPY). Each statement bumps
+    # every affected user once, read from its transition tables, so a bulk insert
+    # of N tasks upserts one row instead of N. Task caches key on it, so a write in
+    # any worker process invalidates the cached lists/stats in all of them
+    create_task_versions = """
+    CREATE TABLE IF NOT EXISTS task_versions (
+        user_id UUID PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    );
+    
+    DROP TRIGGER IF EXISTS tasks_bump_version ON tasks;
+    DROP FUNCTION IF EXISTS bump_task_version();
+    
+    CREATE OR REPLACE FUNCTION bump_task_versions() RETURNS trigger AS $$
+    BEGIN
+        -- Distinct owners, in a fixed order so concurrent statements lock rows alike
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO task_versions (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM new_tasks WHERE user_id IS NOT NULL ORDER BY 1
+            ON CONFLICT (user_id) DO UPDATE SET version = task_versions.version + 1;
+        ELSIF TG_OP = 'UPDATE' THEN
+            INSERT INTO task_versions (user_id, version)
+            SELECT user_id, 1 FROM (
+                SELECT user_id FROM old_tasks UNION SELECT user_id FROM new_tasks
+            ) changed WHERE user_id IS NOT NULL ORDER BY 1
+            ON CONFLICT (user_id) DO UPDATE SET version = task_versions.version + 1;
+        ELSE
+            INSERT INTO task_versions (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM old_tasks WHERE user_id IS NOT NULL ORDER BY 1
+            ON CONFLICT (user_id) DO UPDATE SET version = task_versions.version + 1;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    
+    -- Transition tables allow one event per trigger, hence three triggers
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_bump_version_insert') THEN
+            CREATE TRIGGER tasks_bump_version_insert
+            AFTER INSERT ON tasks REFERENCING NEW TABLE AS new_tasks
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_task_versions();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_bump_version_update') THEN
+            CREATE TRIGGER tasks_bump_version_update
+            AFTER UPDATE ON tasks REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_task_versions();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_bump_version_delete') THEN
+            CREATE TRIGGER tasks_bump_version_delete
+            AFTER DELETE ON tasks REFERENCING OLD TABLE AS old_tasks
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_task_versions();
+        END IF;
+    END;
+    $$;
+    """
+    
+    # Per-user meeting aggregates, refreshed periodically by start_meeting_stats_refresher()
+    # so the stats endpoint is a single index lookup instead of several scans
+    create_meeting_stats_view = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS meeting_stats_by_user AS
+    SELECT s.user_id,
+           SUM(s.cnt)::BIGINT AS total_meetings,
+           jsonb_object_agg(s.status, s.cnt) FILTER (WHERE s.status IS NOT NULL) AS by_status,
+           SUM(s.recent)::BIGINT AS recent_meetings,
+           COALESCE(SUM(s.duration), 0)::BIGINT AS total_duration
+    FROM (
+        SELECT user_id, status, COUNT(*) AS cnt,
+               COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '7 days') AS recent,
+               SUM(duration) AS duration
+        FROM meetings
+        GROUP BY user_id, status
+    ) s
+    GROUP BY s.user_id;
+    """
+    
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    create_meeting_stats_index = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_meeting_stats_by_user_user_id
+    ON meeting_stats_by_user (user_id);
+    """
+    
     try:
         db.execute_query(create_users_table)
         db.execute_query(create_meetings_table)
@@ -259,7 +504,56 @@ def init_db():
         db.execute_query(create_tasks_table)
         db.execute_query(create_processing_status_table)
         db.execute_query(create_notifications_table)
+        db.execute_query(create_tasks_indexes)
+        db.execute_query(create_task_versions)
+        db.execute_query(create_meeting_stats_view)
+        db.execute_query(create_meeting_stats_index)
         print("[SUCCESS] Database tables initialized successfully")
     except Exception as e:
         print(f"[ERROR] Error initializing database: {e}")
         raise e
+
+_stats_refresher_lock = threading.Lock()
+_stats_refresher_started = False
+
+# Every gunicorn worker runs the refresher; this advisory lock key lets only one
+# of them run the REFRESH at a time, the others skip that tick
+MEETING_STATS_REFRESH_LOCK_ID = 4173001
+
+def refresh_meeting_stats():
+    """
+    Refresh the meeting_stats_by_user materialized view without blocking readers
+    Returns False without refreshing when another worker holds the refresh lock
+    """
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            # Transaction-level lock: released by the commit/rollback below, on the
+            # same backend even behind a transaction-mode pooler
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s) AS locked", (MEETING_STATS_REFRESH_LOCK_ID,))
+            if not cursor.fetchone()['locked']:
+                conn.rollback()
+                return False
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY meeting_stats_by_user")
+        conn.commit()
+    return True
+
+def start_meeting_stats_refresher(interval=None):
+    """Start a daemon thread that refreshes meeting_stats_by_user every `interval` seconds"""
+    global _stats_refresher_started
+    
+    interval = interval or int(os.getenv('MEETING_STATS_REFRESH_SECONDS', 60))
+    
+    with _stats_refresher_lock:
+        if _stats_refresher_started:
+            return
+        _stats_refresher_started = True
+    
+    def refresh_loop():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_meeting_stats()
+            except Exception as e:
+                print(f"[ERROR] Failed to refresh meeting stats view: {e}")
+    
+    threading.Thread(target=refresh_loop, name='meeting-stats-refresher', daemon=True).start()
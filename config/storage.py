@@ -1,6 +1,10 @@
 from supabase import create_client, Client
+import io
 import os
-from typing import Optional
+from typing import BinaryIO, Optional, Union
+
+# Read size used when streaming uploads to storage (fewer, larger reads than io's 8KB default)
+UPLOAD_BUFFER_SIZE = 1024 * 1024
 
 class StorageService:
     def __init__(self):
@@ -13,9 +17,19 @@ class StorageService:
         self.client: Client = create_client(self.url, self.key)
         self.bucket_name = 'meeting-audio'
     
-    def upload_file(self, file_path: str, file_data: bytes, content_type: str = 'audio/mpeg') -> Optional[str]:
-        """Upload file to Supabase storage"""
+    def upload_file(self, file_path: str, file_data: Union[bytes, BinaryIO],
+                    content_type: str = 'audio/mpeg') -> Optional[str]:
+        """Upload file to Supabase storage from bytes or a binary file-like stream"""
         try:
+            # The storage client streams BufferedReader objects in chunks instead of
+            # needing the whole file in memory; wrap other streams (e.g. an upload's
+            # spooled temp file) so they take that path. Streams are rewound first,
+            # since validation may have read them to measure the size
+            if not isinstance(file_data, bytes):
+                file_data.seek(0)
+                if not isinstance(file_data, io.BufferedReader):
+                    file_data = io.BufferedReader(file_data, buffer_size=UPLOAD_BUFFER_SIZE)
+            
             # Upload file to storage
             result = self.client.storage.from_(self.bucket_name).upload(
                 path=file_path,
@@ -28,9 +28,9 @@ except Exception as e:
 PY
 
 echo "[entrypoint] Launching Gunicorn"
+# Worker count: Gunicorn reads WEB_CONCURRENCY itself (set in the Dockerfile)
 exec gunicorn \
-  -w "${WEB_CONCURRENCY:-1}" \
-  -k gthread --threads 4 \
+  -k gthread --threads "${GUNICORN_THREADS:-8}" \
   --timeout "${GUNICORN_TIMEOUT:-120}" \
   -b 0.0.0.0:"${PORT:-8000}" \
   app:app \
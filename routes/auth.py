@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from config.database import db
 from middleware.validation import validate_json, add_security_headers, RequestValidator
@@ -51,6 +51,7 @@ def verify_user():
         else:
             # Create new user
             user_id = str(uuid.uuid4())
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
             insert_query = """
             INSERT INTO users (id, firebase_uid, email, name, created_at, updated_at)
             VALUES (%s, %s, %s, %s, %s, %s)
@@ -61,8 +62,8 @@ def verify_user():
                 firebase_uid,
                 email,
                 name or email.split('@')[0],  # Use email prefix as default name
-                datetime.utcnow(),
-                datetime.utcnow()
+                now,
+                now
             ))
             
             return jsonify({
@@ -72,7 +73,7 @@ def verify_user():
                     'firebase_uid': firebase_uid,
                     'email': email,
                     'name': name or email.split('@')[0],
-                    'created_at': datetime.utcnow().isoformat()
+                    'created_at': now.isoformat()
                 },
                 'is_new_user': True
             }), 201
@@ -156,11 +157,11 @@ def update_user(firebase_uid):
         if not data:
             return jsonify({'error': 'Request data is required'}), 400
         
-        # Check if user exists
-        check_query = "SELECT id FROM users WHERE firebase_uid = %s"
+        # Check if user exists (a single boolean, no row materialized)
+        check_query = "SELECT EXISTS(SELECT 1 FROM users WHERE firebase_uid = %s) AS found"
         check_result = db.execute_query(check_query, (firebase_uid,))
         
-        if not check_result:
+        if not check_result[0]['found']:
             return jsonify({'error': 'User not found'}), 404
         
         # Build update query dynamically
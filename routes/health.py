@@ -1,56 +1,65 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, stream_with_context
 from datetime import datetime
+import json
+import os
+import threading
+import time
 import psycopg2
 
 from config.database import db
 from config.storage import storage
 from services.transcription import transcription_service
-from services.ai_processor import ai_processor
-from services.calendar_sync import calendar_service
+from services.ai_processor import get_ai_processor
+from services.calendar_sync import get_calendar_service
 from services.email_service import email_service
+from routes.responses import precompute_json, timestamped_json_response
 
 health_bp = Blueprint('health', __name__)
 
-@health_bp.route('/', methods=['GET'])
-def health_check():
-    """Basic health check - always returns 200 to prevent frontend errors"""
+def build_liveness_health():
+    """Collect the basic health payload (cheap liveness probes only)"""
+    health_status = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'overall_status': 'healthy',
+        'services': {}
+    }
+    
+    # Check database health (most critical)
     try:
-        health_status = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'overall_status': 'healthy',
-            'services': {}
+        db_health = check_database_health()
+        health_status['services']['database'] = db_health
+    except Exception as e:
+        health_status['services']['database'] = {
+            'status': 'unhealthy',
+            'error': str(e)
         }
-        
-        # Check database health (most critical)
+    
+    # Check other services safely (cheap liveness probes; deep checks live under /detailed)
+    services_to_check = [
+        ('storage', lambda: check_storage_health()),
+        ('transcription', lambda: transcription_service.get_transcription_health(mode='liveness')),
+        ('ai_processor', lambda: get_ai_processor().get_ai_health(mode='liveness')),
+        ('calendar', lambda: get_calendar_service().get_calendar_health(mode='liveness')),
+        ('email', lambda: email_service.get_email_health(mode='liveness'))
+    ]
+    
+    for service_name, check_func in services_to_check:
         try:
-            db_health = check_database_health()
-            health_status['services']['database'] = db_health
+            health_status['services'][service_name] = check_func()
         except Exception as e:
-            health_status['services']['database'] = {
+            health_status['services'][service_name] = {
                 'status': 'unhealthy',
                 'error': str(e)
             }
-        
-        # Check other services safely
-        services_to_check = [
-            ('storage', lambda: check_storage_health()),
-            ('transcription', lambda: transcription_service.get_transcription_health()),
-            ('ai_processor', lambda: ai_processor.get_ai_health()),
-            ('calendar', lambda: calendar_service.get_calendar_health()),
-            ('email', lambda: email_service.get_email_health())
-        ]
-        
-        for service_name, check_func in services_to_check:
-            try:
-                health_status['services'][service_name] = check_func()
-            except Exception as e:
-                health_status['services'][service_name] = {
-                    'status': 'unhealthy',
-                    'error': str(e)
-                }
-        
+    
+    return health_status
+
+@health_bp.route('/', methods=['GET'])
+def health_check():
+    """Basic health check - always returns 200 to prevent frontend errors"""
+    try:
         # Always return 200 to prevent frontend connection issues
-        return jsonify(health_status), 200
+        return jsonify(build_liveness_health()), 200
         
     except Exception as e:
         # Even if everything fails, return 200 with error info
@@ -79,54 +88,58 @@ def transcription_health():
 @health_bp.route('/ai', methods=['GET'])
 def ai_health():
     """Check AI processor status"""
-    return jsonify(ai_processor.get_ai_health())
+    return jsonify(get_ai_processor().get_ai_health())
 
 @health_bp.route('/calendar', methods=['GET'])
 def calendar_health():
     """Check calendar service status"""
-    return jsonify(calendar_service.get_calendar_health())
+    return jsonify(get_calendar_service().get_calendar_health())
 
 @health_bp.route('/email', methods=['GET'])
 def email_health():
     """Check email service status"""
     return jsonify(email_service.get_email_health())
 
+def build_detailed_health():
+    """Collect the detailed health payload (deep probes plus metrics)"""
+    detailed_status = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'services': {},
+        'metrics': {}
+    }
+    
+    # Database metrics
+    db_metrics = get_database_metrics()
+    detailed_status['services']['database'] = {
+        **check_database_health(),
+        'metrics': db_metrics
+    }
+    
+    # Storage metrics
+    storage_metrics = get_storage_metrics()
+    detailed_status['services']['storage'] = {
+        **check_storage_health(),
+        'metrics': storage_metrics
+    }
+    
+    # API services
+    detailed_status['services']['transcription'] = transcription_service.get_transcription_health(mode='deep')
+    detailed_status['services']['ai_processor'] = get_ai_processor().get_ai_health(mode='deep')
+    detailed_status['services']['calendar'] = get_calendar_service().get_calendar_health(mode='deep')
+    detailed_status['services']['email'] = email_service.get_email_health(mode='deep')
+    
+    # Overall metrics
+    detailed_status['metrics']['total_meetings'] = db_metrics.get('total_meetings', 0)
+    detailed_status['metrics']['total_tasks'] = db_metrics.get('total_tasks', 0)
+    detailed_status['metrics']['processing_queue'] = db_metrics.get('processing_meetings', 0)
+
+    return detailed_status
+
 @health_bp.route('/detailed', methods=['GET'])
 def detailed_health():
     """Detailed health check with metrics"""
     try:
-        detailed_status = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'services': {},
-            'metrics': {}
-        }
-        
-        # Database metrics
-        db_metrics = get_database_metrics()
-        detailed_status['services']['database'] = {
-            **check_database_health(),
-            'metrics': db_metrics
-        }
-        
-        # Storage metrics
-        storage_metrics = get_storage_metrics()
-        detailed_status['services']['storage'] = {
-            **check_storage_health(),
-            'metrics': storage_metrics
-        }
-        
-        # API services
-        detailed_status['services']['transcription'] = transcription_service.get_transcription_health()
-        detailed_status['services']['ai_processor'] = ai_processor.get_ai_health()
-        detailed_status['services']['calendar'] = calendar_service.get_calendar_health()
-        detailed_status['services']['email'] = email_service.get_email_health()
-        
-        # Overall metrics
-        detailed_status['metrics']['total_meetings'] = db_metrics.get('total_meetings', 0)
-        detailed_status['metrics']['total_tasks'] = db_metrics.get('total_tasks', 0)
-        detailed_status['metrics']['processing_queue'] = db_metrics.get('processing_meetings', 0)
-        
-        return jsonify(detailed_status), 200
+        return jsonify(build_detailed_health()), 200
         
     except Exception as e:
         return jsonify({
@@ -134,6 +147,95 @@ def detailed_health():
             'error': str(e)
         }), 500
 
+# Push model for dashboards: one background refresher computes the liveness
+# payload and every /stream subscriber receives it, instead of each client
+# polling /. Deep probes bill the upstream APIs, so they stay on /detailed.
+# The refresher runs only while someone is subscribed, and each connection is
+# closed after HEALTH_STREAM_MAX_SECONDS so it does not pin a worker thread
+# forever (EventSource clients reconnect on their own).
+HEALTH_STREAM_INTERVAL = int(os.getenv('HEALTH_STREAM_INTERVAL', '10'))
+HEALTH_STREAM_MAX_SECONDS = int(os.getenv('HEALTH_STREAM_MAX_SECONDS', '300'))
+HEALTH_STREAM_KEEPALIVE = 15
+
+_stream_condition = threading.Condition()
+_stream_state = {'version': 0, 'event': None, 'subscribers': 0}
+_stream_thread = None
+
+def _refresh_health_stream():
+    """Recompute the liveness payload and publish it when it changed"""
+    global _stream_thread
+    last_snapshot = None
+    while True:
+        with _stream_condition:
+            if _stream_state['subscribers'] == 0:
+                _stream_thread = None
+                return
+        
+        try:
+            payload = build_liveness_health()
+        except Exception as e:
+            payload = {'timestamp': datetime.utcnow().isoformat(), 'error': str(e)}
+        
+        # Compare without the timestamp so unchanged health is not re-sent
+        snapshot = json.dumps({k: v for k, v in payload.items() if k != 'timestamp'},
+                              sort_keys=True, default=str)
+        if snapshot != last_snapshot:
+            last_snapshot = snapshot
+            event = f"data: {json.dumps(payload, default=str)}\n\n"
+            with _stream_condition:
+                _stream_state['version'] += 1
+                _stream_state['event'] = event
+                _stream_condition.notify_all()
+        
+        time.sleep(HEALTH_STREAM_INTERVAL)
+
+def _subscribe_health_stream():
+    """Register a subscriber, starting the refresher if none is running"""
+    global _stream_thread
+    with _stream_condition:
+        _stream_state['subscribers'] += 1
+        if _stream_thread is None:
+            _stream_thread = threading.Thread(target=_refresh_health_stream,
+                                              name='health-stream-refresher', daemon=True)
+            _stream_thread.start()
+            # A fresh refresher always publishes, so skip the stale event
+            return _stream_state['version']
+        return _stream_state['version'] - 1 if _stream_state['event'] else 0
+
+def _unsubscribe_health_stream():
+    """Drop a subscriber; the refresher exits once none are left"""
+    with _stream_condition:
+        _stream_state['subscribers'] -= 1
+
+@health_bp.route('/stream', methods=['GET'])
+def health_stream():
+    """Server-Sent Events stream of liveness health updates"""
+    
+    def generate():
+        seen_version = _subscribe_health_stream()
+        deadline = time.monotonic() + HEALTH_STREAM_MAX_SECONDS
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                with _stream_condition:
+                    _stream_condition.wait_for(lambda: _stream_state['version'] > seen_version,
+                                               timeout=min(HEALTH_STREAM_KEEPALIVE, remaining))
+                    version = _stream_state['version']
+                    event = _stream_state['event']
+                if version > seen_version:
+                    seen_version = version
+                    yield event
+                else:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+        finally:
+            _unsubscribe_health_stream()
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 def check_database_health():
     """Check database connectivity and basic operations"""
     try:
@@ -266,62 +368,57 @@ def get_storage_metrics():
     except Exception as e:
         return {'error': str(e)}
 
+# Static route listing, serialized once at import instead of on every request
+_ROUTES_PAYLOAD = {
+    'routes': {
+        'auth': {
+            'status': 'active',
+            'endpoints': ['/api/auth/verify']
+        },
+        'meetings': {
+            'status': 'active',
+            'endpoints': [
+                '/api/meetings',
+                '/api/meetings/<id>',
+                '/api/meetings/<id>/timeline',
+                '/api/meetings/<id>/summary'
+            ]
+        },
+        'tasks': {
+            'status': 'active',
+            'endpoints': [
+                '/api/tasks',
+                '/api/tasks/<id>',
+                '/api/tasks/<id>/status'
+            ]
+        },
+        'upload': {
+            'status': 'active',
+            'endpoints': [
+                '/api/upload/audio',
+                '/api/upload/status/<meeting_id>'
+            ]
+        },
+        'health': {
+            'status': 'active',
+            'endpoints': [
+                '/api/health',
+                '/api/health/database',
+                '/api/health/storage',
+                '/api/health/transcription',
+                '/api/health/ai',
+                '/api/health/calendar',
+                '/api/health/email',
+                '/api/health/detailed',
+                '/api/health/stream',
+                '/api/health/routes'
+            ]
+        }
+    }
+}
+_ROUTES_BODY = precompute_json(_ROUTES_PAYLOAD)
+
 @health_bp.route('/routes', methods=['GET'])
 def routes_health():
     """Check all API routes and their status"""
-    try:
-        routes_status = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'routes': {
-                'auth': {
-                    'status': 'active',
-                    'endpoints': ['/api/auth/verify']
-                },
-                'meetings': {
-                    'status': 'active',
-                    'endpoints': [
-                        '/api/meetings',
-                        '/api/meetings/<id>',
-                        '/api/meetings/<id>/timeline',
-                        '/api/meetings/<id>/summary'
-                    ]
-                },
-                'tasks': {
-                    'status': 'active',
-                    'endpoints': [
-                        '/api/tasks',
-                        '/api/tasks/<id>',
-                        '/api/tasks/<id>/status'
-                    ]
-                },
-                'upload': {
-                    'status': 'active',
-                    'endpoints': [
-                        '/api/upload/audio',
-                        '/api/upload/status/<meeting_id>'
-                    ]
-                },
-                'health': {
-                    'status': 'active',
-                    'endpoints': [
-                        '/api/health',
-                        '/api/health/database',
-                        '/api/health/storage',
-                        '/api/health/transcription',
-                        '/api/health/ai',
-                        '/api/health/calendar',
-                        '/api/health/email',
-                        '/api/health/detailed',
-                        '/api/health/routes'
-                    ]
-                }
-            }
-        }
-        
-        return jsonify(routes_status), 200
-        
-    except Exception as e:
-        return jsonify({
-            'timestamp': datetime.utcnow().isoformat(),
-            'error': str(e)
-        }), 500
+    return timestamped_json_response(_ROUTES_BODY)
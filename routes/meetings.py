@@ -1,16 +1,28 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import logging
 
 from config.database import db
-from middleware.validation import add_security_headers
+from middleware.validation import add_security_headers, RequestValidator
+from routes.responses import precompute_json, timestamped_json_response
+
+logger = logging.getLogger(__name__)
 
 meetings_bp = Blueprint('meetings', __name__)
 
+# Static bodies for the test endpoints, serialized once at import
+_TEST_BODY = precompute_json({'message': 'Meetings blueprint is working!'})
+_TIMELINE_TEST_BODY = precompute_json({
+    'message': 'Timeline test endpoint working',
+    'blueprint_name': meetings_bp.name,
+    'url_prefix': meetings_bp.url_prefix
+})
+
 # Test and debug endpoints (must be before parameterized routes)
 @meetings_bp.route('/test', methods=['GET'])
 def test_meetings_bp():
     """Test endpoint to verify meetings blueprint is working"""
-    return jsonify({'message': 'Meetings blueprint is working!', 'timestamp': datetime.utcnow().isoformat()}), 200
+    return timestamped_json_response(_TEST_BODY)
 
 @meetings_bp.route('/debug', methods=['GET'])
 def debug_meetings_bp():
@@ -26,12 +38,7 @@ def debug_meetings_bp():
 @meetings_bp.route('/timeline-test', methods=['GET'])
 def timeline_test_simple():
     """Simple test for timeline endpoint"""
-    return jsonify({
-        'message': 'Timeline test endpoint working',
-        'blueprint_name': meetings_bp.name,
-        'url_prefix': meetings_bp.url_prefix,
-        'timestamp': datetime.utcnow().isoformat()
-    }), 200
+    return timestamped_json_response(_TIMELINE_TEST_BODY)
 
 
 
@@ -81,12 +88,7 @@ def get_meetings():
         """
         
         meetings = db.execute_query(query, (user_id, limit, offset))
-        print(f"📊 Found {len(meetings) if meetings else 0} meetings for user {user_id}")
-        
-        # Debug: Print meeting IDs to check format
-        if meetings:
-            for meeting in meetings:
-                print(f"📊 Meeting ID: {meeting['id']} (type: {type(meeting['id'])})")
+        logger.debug("📊 Found %d meetings for user %s", len(meetings) if meetings else 0, user_id)
         
         # Get total count
         count_query = """
@@ -129,13 +131,7 @@ def get_meetings():
 @add_security_headers()
 def get_meeting_timeline(meeting_id):
     """Get timeline for a specific meeting"""
-    print(f"[DEBUG] Timeline endpoint called with meeting_id: {meeting_id}")
-    print(f"[DEBUG] Request method: {request.method}")
-    print(f"[DEBUG] Request URL: {request.url}")
-    print(f"[DEBUG] Request headers: {dict(request.headers)}")
-    print(f"[DEBUG] Blueprint name: {meetings_bp.name}")
-    print(f"[DEBUG] Blueprint URL prefix: {meetings_bp.url_prefix}")
-    print(f"[DEBUG] Full route pattern: /api/meetings/<meeting_id>/timeline")
+    logger.debug("Timeline endpoint called: meeting_id=%s method=%s url=%s", meeting_id, request.method, request.url)
     
     try:
         # Handle preflight requests
@@ -147,47 +143,31 @@ def get_meeting_timeline(meeting_id):
             response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
             return response
         
-        # Validate meeting_id format
-        import re
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$'
-        if not re.match(uuid_pattern, meeting_id, re.IGNORECASE):
-            print(f"[ERROR] Invalid meeting_id format: {meeting_id}")
+        # Validate meeting_id format (precompiled pattern)
+        if not RequestValidator.validate_uuid(meeting_id):
+            logger.warning("Invalid meeting_id format: %s", meeting_id)
             return jsonify({'error': f'Invalid meeting ID format: {meeting_id}'}), 400
         
-        # Get timeline entries for the meeting
+        # Get timeline entries for the meeting, formatted by Postgres so rows
+        # can be returned as-is (MM:SS timestamp, ISO created_at, [] participants)
         query = """
-        SELECT id, meeting_id, timestamp_minutes, event_type, title, content, 
-               participants, created_at
+        SELECT id, meeting_id,
+               to_char(FLOOR(timestamp_minutes), 'FM9999900') || ':' ||
+                   to_char(FLOOR((timestamp_minutes - FLOOR(timestamp_minutes)) * 60), 'FM00') AS "timestamp",
+               timestamp_minutes, event_type, title, content,
+               COALESCE(participants, '{}'::text[]) AS participants,
+               to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS created_at
         FROM timeline 
         WHERE meeting_id = %s 
         ORDER BY timestamp_minutes ASC
         """
         
-        result = db.execute_query(query, (meeting_id,))
+        timeline_entries = db.execute_query(query, (meeting_id,))
         
-        if result is None:
+        if timeline_entries is None:
             return jsonify({'error': 'Failed to fetch timeline'}), 500
         
-        timeline_entries = []
-        for row in result:
-            # Convert timestamp_minutes to MM:SS format
-            minutes = int(row['timestamp_minutes']) if row['timestamp_minutes'] else 0
-            seconds = int((row['timestamp_minutes'] - minutes) * 60) if row['timestamp_minutes'] else 0
-            timestamp_str = f"{minutes:02d}:{seconds:02d}"
-            
-            timeline_entries.append({
-                'id': row['id'],
-                'meeting_id': row['meeting_id'],
-                'timestamp': timestamp_str,
-                'timestamp_minutes': row['timestamp_minutes'],
-                'event_type': row['event_type'],
-                'title': row['title'],
-                'content': row['content'],
-                'participants': row['participants'] or [],
-                'created_at': row['created_at'].isoformat() if row['created_at'] else None
-            })
-        
-        print(f"[SUCCESS] Timeline fetched successfully: {len(timeline_entries)} entries")
+        logger.debug("Timeline fetched successfully: %d entries", len(timeline_entries))
         
         return jsonify({
             'meeting_id': meeting_id,
@@ -196,7 +176,7 @@ def get_meeting_timeline(meeting_id):
         }), 200
         
     except Exception as e:
-        print(f"[ERROR] Timeline error: {str(e)}")
+        logger.error("Timeline error for meeting %s: %s", meeting_id, e)
         return jsonify({'error': f'Failed to get timeline: {str(e)}'}), 500
 
 @meetings_bp.route('/<meeting_id>', methods=['GET'])
@@ -277,28 +257,22 @@ def get_meeting_summary(meeting_id):
 def delete_meeting(meeting_id):
     """Delete a meeting and all related data"""
     try:
-        # Check if meeting exists
-        meeting_query = "SELECT audio_url FROM meetings WHERE id = %s"
-        meeting_result = db.execute_query(meeting_query, (meeting_id,))
+        # Delete from database (cascading deletes will handle related tables);
+        # RETURNING doubles as the existence check
+        delete_query = "DELETE FROM meetings WHERE id = %s RETURNING audio_url, user_id"
+        deleted = db.execute_query(delete_query, (meeting_id,))
         
-        if not meeting_result:
+        if not deleted:
             return jsonify({'error': 'Meeting not found'}), 404
         
-        # Delete from database (cascading deletes will handle related tables)
-        delete_query = "DELETE FROM meetings WHERE id = %s"
-        deleted_count = db.execute_query(delete_query, (meeting_id,))
-        
-        if deleted_count > 0:
-            # TODO: Delete audio file from storage
-            # audio_url = meeting_result[0]['audio_url']
-            # storage.delete_file(audio_url)
-            
-            return jsonify({
-                'success': True,
-                'message': 'Meeting deleted successfully'
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to delete meeting'}), 500
+        # TODO: Delete audio file from storage
+        # audio_url = deleted[0]['audio_url']
+        # storage.delete_file(audio_url)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Meeting deleted successfully'
+        }), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to delete meeting: {str(e)}'}), 500
@@ -307,29 +281,37 @@ def delete_meeting(meeting_id):
 def reprocess_meeting(meeting_id):
     """Reprocess a meeting (re-run AI analysis)"""
     try:
-        # Check if meeting exists and has transcript
-        meeting_query = "SELECT transcript, title, audio_url FROM meetings WHERE id = %s"
-        meeting_result = db.execute_query(meeting_query, (meeting_id,))
-        
-        if not meeting_result:
-            return jsonify({'error': 'Meeting not found'}), 404
-        
-        meeting = meeting_result[0]
-        
-        if not meeting['transcript']:
+        # Mark the meeting as processing and clear its timeline, tasks and processing
+        # status in a single statement. The transcript check is part of the UPDATE,
+        # so nothing is cleared unless the meeting can actually be reprocessed.
+        reprocess_query = """
+        WITH m AS (
+            UPDATE meetings SET status = 'processing', updated_at = %s
+            WHERE id = %s AND transcript IS NOT NULL AND transcript <> ''
+            RETURNING id, title, user_id
+        ),
+        cleared_timeline AS (
+            DELETE FROM timeline WHERE meeting_id IN (SELECT id FROM m)
+        ),
+        cleared_tasks AS (
+            DELETE FROM tasks WHERE meeting_id IN (SELECT id FROM m)
+        ),
+        cleared_status AS (
+            DELETE FROM processing_status WHERE meeting_id IN (SELECT id FROM m)
+        )
+        SELECT id, title, user_id FROM m
+        """
+        reprocessed = db.execute_query(reprocess_query, (datetime.utcnow(), meeting_id))
+        
+        if not reprocessed:
+            # Only the failure path pays for telling "missing" apart from "no transcript"
+            exists_result = db.execute_query(
+                "SELECT EXISTS(SELECT 1 FROM meetings WHERE id = %s) AS found", (meeting_id,)
+            )
+            if not exists_result[0]['found']:
+                return jsonify({'error': 'Meeting not found'}), 404
             return jsonify({'error': 'Meeting has no transcript to reprocess'}), 400
         
-        # Update meeting status
-        update_query = "UPDATE meetings SET status = %s, updated_at = %s WHERE id = %s"
-        db.execute_query(update_query, ('processing', datetime.utcnow(), meeting_id))
-        
-        # Clear existing timeline and tasks
-        db.execute_query("DELETE FROM timeline WHERE meeting_id = %s", (meeting_id,))
-        db.execute_query("DELETE FROM tasks WHERE meeting_id = %s", (meeting_id,))
-        
-        # Reset processing status
-        db.execute_query("DELETE FROM processing_status WHERE meeting_id = %s", (meeting_id,))
-        
         # Start reprocessing (this would typically be done asynchronously)
         # For now, return success message
         return jsonify({
@@ -349,39 +331,16 @@ def get_meeting_stats():
         if not user_id:
             return jsonify({'error': 'User ID is required'}), 400
         
-        # Get various statistics
-        stats = {}
-        
-        # Total meetings
-        total_query = """
-        SELECT COUNT(*) as count
-        FROM meetings m
-        WHERE m.user_id = %s
-        """
-        total_result = db.execute_query(total_query, (user_id,))
-        stats['total_meetings'] = total_result[0]['count'] if total_result else 0
-        
-        # Meetings by status
-        status_query = """
-        SELECT status, COUNT(*) as count
-        FROM meetings m
-        WHERE m.user_id = %s 
-        GROUP BY status
-        """
-        status_result = db.execute_query(status_query, (user_id,))
-        stats['by_status'] = {row['status']: row['count'] for row in status_result}
-        
-        # Total tasks
-        tasks_query = """
-        SELECT COUNT(*) as count
-        FROM tasks t
-        JOIN meetings m ON t.meeting_id = m.id 
-        WHERE m.user_id = %s
+        # Meeting aggregates come from the periodically refreshed materialized view
+        stats_query = """
+        SELECT total_meetings, by_status, recent_meetings, total_duration
+        FROM meeting_stats_by_user
+        WHERE user_id = %s
         """
-        tasks_result = db.execute_query(tasks_query, (user_id,))
-        stats['total_tasks'] = tasks_result[0]['count'] if tasks_result else 0
+        stats_result = db.execute_query(stats_query, (user_id,))
+        meeting_stats = stats_result[0] if stats_result else {}
         
-        # Tasks by status
+        # Task counts by status in one pass; the total is their sum
         task_status_query = """
         SELECT t.status, COUNT(*) as count
         FROM tasks t
@@ -390,27 +349,18 @@ def get_meeting_stats():
         GROUP BY t.status
         """
         task_status_result = db.execute_query(task_status_query, (user_id,))
-        stats['tasks_by_status'] = {row['status']: row['count'] for row in task_status_result}
-        
-        # Recent activity (last 7 days)
-        recent_query = """
-        SELECT COUNT(*) as count
-        FROM meetings m
-        WHERE m.user_id = %s AND m.created_at > NOW() - INTERVAL '7 days'
-        """
-        recent_result = db.execute_query(recent_query, (user_id,))
-        stats['recent_meetings'] = recent_result[0]['count'] if recent_result else 0
-        
-        # Total duration
-        duration_query = """
-        SELECT SUM(duration) as total_duration
-        FROM meetings m
-        WHERE m.user_id = %s AND m.duration IS NOT NULL
-        """
-        duration_result = db.execute_query(duration_query, (user_id,))
-        total_duration = duration_result[0]['total_duration'] if duration_result and duration_result[0]['total_duration'] else 0
-        stats['total_duration_minutes'] = int(total_duration)
-        stats['total_duration_hours'] = round(total_duration / 60, 2)
+        tasks_by_status = {row['status']: row['count'] for row in task_status_result}
+        
+        total_duration = meeting_stats.get('total_duration') or 0
+        stats = {
+            'total_meetings': meeting_stats.get('total_meetings') or 0,
+            'by_status': meeting_stats.get('by_status') or {},
+            'total_tasks': sum(tasks_by_status.values()),
+            'tasks_by_status': tasks_by_status,
+            'recent_meetings': meeting_stats.get('recent_meetings') or 0,
+            'total_duration_minutes': int(total_duration),
+            'total_duration_hours': round(total_duration / 60, 2)
+        }
         
         return jsonify(stats), 200
         
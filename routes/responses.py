@@ -0,0 +1,16 @@
+"""
+Helpers for serving precomputed JSON bodies from route handlers
+"""
+
+import json
+from datetime import datetime
+from flask import Response
+
+def precompute_json(payload: dict) -> bytes:
+    """Serialize a static JSON object once so handlers can reuse the bytes"""
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def timestamped_json_response(body: bytes, status: int = 200) -> Response:
+    """Return a precomputed JSON object body with a fresh "timestamp" key prepended"""
+    timestamp = datetime.utcnow().isoformat().encode('ascii')
+    return Response(b'{"timestamp":"' + timestamp + b'",' + body[1:], status=status, mimetype='application/json')
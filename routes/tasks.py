@@ -1,23 +1,214 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import base64
+import hashlib
+import itertools
+import json
 import logging
-import traceback
+from operator import itemgetter
 
+from config.cache import cache
 from config.database import db
-from services.calendar_sync import calendar_service
+from services.calendar_sync import get_calendar_service
+from services.background import background_tasks
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in app.py (LOG_LEVEL=WARNING keeps these hot
+# paths quiet in production)
 logger = logging.getLogger(__name__)
 
 tasks_bp = Blueprint('tasks', __name__)
 
+# Page size bounds for GET /api/tasks
+DEFAULT_TASKS_LIMIT = 50
+MAX_TASKS_LIMIT = 200
+
+# Allowed values for task status / priority updates
+VALID_STATUSES = frozenset({'pending', 'in_progress', 'completed'})
+VALID_PRIORITIES = frozenset({'high', 'medium', 'low'})
+_STATUS_ERR = f'Invalid status. Must be one of: {sorted(VALID_STATUSES)}'
+_PRIORITY_ERR = f'Invalid priority. Must be one of: {sorted(VALID_PRIORITIES)}'
+
+# Seconds a per-user task list / stats payload stays cached. The cache is per
+# process and gunicorn runs several workers, so entries are keyed by the user's
+# task_versions row in Postgres: a write in any worker changes the key everywhere.
+# Reading that version is a primary-key lookup on every request, so a hit only
+# saves the list / aggregate query, not the round-trip
+TASKS_CACHE_TIMEOUT = 30
+
+# SQL lives in module-level constants so each statement's text is built once
+# and stays byte-identical across calls
+# Single task with its meeting title
+TASK_DETAIL_QUERY = """
+SELECT t.id, t.meeting_id, t.title, t.description, t.assigned_to, t.deadline,
+       t.priority, t.status, t.calendar_event_id, t.created_at, t.updated_at,
+       m.title AS meeting_title
+FROM tasks t
+JOIN meetings m ON t.meeting_id = m.id
+WHERE t.id = %s
+"""
+
+# Status change; RETURNING doubles as the existence check
+UPDATE_TASK_STATUS_QUERY = """
+UPDATE tasks
+SET status = %s, updated_at = NOW()
+WHERE id = %s
+RETURNING id, user_id
+"""
+
+# Open tasks due within the next N days
+UPCOMING_TASKS_QUERY = """
+SELECT t.id, t.meeting_id, t.title, t.description, t.assigned_to, t.deadline,
+       (t.deadline::date - CURRENT_DATE) AS days_until_deadline,
+       (t.deadline::date < CURRENT_DATE) AS is_overdue,
+       t.priority, t.status, m.title AS meeting_title
+FROM tasks t
+JOIN meetings m ON t.meeting_id = m.id
+WHERE t.user_id = %s
+AND t.deadline IS NOT NULL
+AND t.deadline <= NOW() + make_interval(days => %s)
+AND t.status != 'completed'
+ORDER BY t.deadline ASC
+"""
+
+# All task stats aggregates in one pass over the user's tasks
+TASK_STATS_QUERY = """
+SELECT COUNT(*) AS total,
+       COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+       COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+       COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+       COUNT(*) FILTER (WHERE priority = 'high') AS p_high,
+       COUNT(*) FILTER (WHERE priority = 'medium') AS p_medium,
+       COUNT(*) FILTER (WHERE priority = 'low') AS p_low,
+       COUNT(*) FILTER (WHERE deadline < NOW() AND status != 'completed') AS overdue,
+       COUNT(*) FILTER (WHERE deadline BETWEEN NOW() AND NOW() + INTERVAL '7 days'
+                        AND status != 'completed') AS due_week
+FROM tasks
+WHERE user_id = %s
+"""
+
+# Base task list query; filters, keyset predicate and ORDER BY are appended
+TASKS_LIST_QUERY = """
+SELECT t.id, t.meeting_id, t.title, t.description, t.assigned_to, t.deadline,
+       t.priority, t.status, t.calendar_event_id, t.created_at, t.updated_at,
+       m.title AS meeting_title
+FROM tasks t
+JOIN meetings m ON t.meeting_id = m.id
+WHERE t.user_id = %s
+"""
+
+# Fields update_task accepts
+UPDATABLE_TASK_FIELDS = ('title', 'description', 'assigned_to', 'deadline', 'priority', 'status')
+
+# Partial task update as a single static statement. Nullable columns use a
+# "present" flag so a client can clear them explicitly with null; the others
+# keep their value when the parameter is NULL.
+UPDATE_TASK_QUERY = """
+UPDATE tasks
+SET title = COALESCE(%(title)s, title),
+    description = CASE WHEN %(description_set)s THEN %(description)s ELSE description END,
+    assigned_to = CASE WHEN %(assigned_to_set)s THEN %(assigned_to)s ELSE assigned_to END,
+    deadline = CASE WHEN %(deadline_set)s THEN %(deadline)s::timestamp ELSE deadline END,
+    priority = COALESCE(%(priority)s, priority),
+    status = COALESCE(%(status)s, status),
+    updated_at = NOW()
+WHERE id = %(task_id)s
+RETURNING id, user_id, meeting_id, title, description, assigned_to, deadline,
+          priority, status, calendar_event_id, created_at, updated_at
+"""
+
+# Optional get_tasks filters, in the order their params are bound
+_TASKS_FILTER_SQL = (" AND t.status = %s", " AND t.priority = %s", " AND t.meeting_id = %s")
+
+# Keyset predicates: rows strictly after the cursor in
+# (deadline ASC NULLS LAST, created_at DESC, id DESC) order
+_TASKS_CURSOR_SQL = {
+    None: "",
+    'deadline': """
+AND (t.deadline > %s OR t.deadline IS NULL
+     OR (t.deadline = %s AND (t.created_at, t.id) < (%s, %s)))""",
+    'null_deadline': " AND t.deadline IS NULL AND (t.created_at, t.id) < (%s, %s)"
+}
+
+_TASKS_ORDER_SQL = " ORDER BY t.deadline ASC NULLS LAST, t.created_at DESC, t.id DESC LIMIT %s"
+
+# Every get_tasks statement, keyed by (has_status, has_priority, has_meeting, cursor_kind),
+# built once at import so requests never assemble SQL
+_TASKS_LIST_QUERIES = {
+    (*flags, cursor_kind): (
+        TASKS_LIST_QUERY
+        + ''.join(sql for flag, sql in zip(flags, _TASKS_FILTER_SQL) if flag)
+        + _TASKS_CURSOR_SQL[cursor_kind]
+        + _TASKS_ORDER_SQL
+    )
+    for flags in itertools.product((False, True), repeat=3)
+    for cursor_kind in _TASKS_CURSOR_SQL
+}
+
+# Current per-user task version (maintained by the tasks_bump_version trigger)
+TASK_VERSION_QUERY = "SELECT version FROM task_versions WHERE user_id = %s"
+
+# Delete; RETURNING doubles as the existence check
+DELETE_TASK_QUERY = "DELETE FROM tasks WHERE id = %s RETURNING id, user_id"
+
+def _task_version(user_id):
+    """The user's task version as stored in Postgres (0 before their first task write)"""
+    result = db.execute_query(TASK_VERSION_QUERY, (user_id,))
+    return result[0]['version'] if result else 0
+
+def _tasks_cache_key(user_id, *filters):
+    """Cache key for one user's task list under their current task version and a filter/page combination"""
+    version = _task_version(user_id)
+    digest = hashlib.sha1('|'.join(str(f) for f in filters).encode()).hexdigest()
+    return f"tasks:{user_id}:{version}:{digest}"
+
+_TASK_COLS = itemgetter('id', 'meeting_id', 'title', 'description', 'assigned_to', 'deadline',
+                        'priority', 'status', 'calendar_event_id', 'created_at', 'updated_at')
+
+def format_task(row):
+    """Build the API representation of a task row"""
+    (task_id, meeting_id, title, description, assigned_to, deadline,
+     priority, status, calendar_event_id, created_at, updated_at) = _TASK_COLS(row)
+    return {
+        'id': task_id,
+        'meeting_id': meeting_id,
+        'title': title,
+        'description': description,
+        'assigned_to': assigned_to,
+        'deadline': deadline.isoformat() if deadline else None,
+        'priority': priority,
+        'status': status,
+        'calendar_event_id': calendar_event_id,
+        'created_at': created_at.isoformat() if created_at else None,
+        'updated_at': updated_at.isoformat() if updated_at else None
+    }
+
+def _encode_cursor(task):
+    """Encode the sort key of the last task on a page as an opaque cursor"""
+    key = [
+        task['deadline'].isoformat() if task['deadline'] else None,
+        task['created_at'].isoformat(),
+        str(task['id'])
+    ]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_cursor(cursor):
+    """Decode a cursor into (deadline, created_at, id); raises ValueError if malformed"""
+    try:
+        deadline, created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (
+            datetime.fromisoformat(deadline) if deadline else None,
+            datetime.fromisoformat(created_at),
+            task_id
+        )
+    except Exception as e:
+        raise ValueError(f'Invalid cursor: {str(e)}')
+
 @tasks_bp.route('', methods=['GET'])
 def get_tasks():
     """Get all tasks for a user"""
     try:
         user_id = request.args.get('user_id')
-        logger.info(f"📋 Fetching tasks for user_id: {user_id}")
+        logger.info("📋 Fetching tasks for user_id: %s", user_id)
         
         if not user_id:
             logger.warning("❌ No user_id provided in request")
@@ -28,64 +219,68 @@ def get_tasks():
         priority = request.args.get('priority')  # high, medium, low
         meeting_id = request.args.get('meeting_id')
         
-        # Build query - use database user_id directly
-        query = """
-        SELECT t.*, m.title as meeting_title 
-        FROM tasks t
-        JOIN meetings m ON t.meeting_id = m.id
-        WHERE t.user_id = %s
-        """
+        # Pagination parameters
+        try:
+            limit = min(max(int(request.args.get('limit', DEFAULT_TASKS_LIMIT)), 1), MAX_TASKS_LIMIT)
+            cursor = request.args.get('cursor')
+            after = _decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        cache_key = _tasks_cache_key(user_id, status, priority, meeting_id, limit, cursor)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200
+        
+        # Pick the prebuilt SQL for this filter/cursor combination; params are
+        # appended in the same fixed order the fragments were joined in
         params = [user_id]
+        for value in (status, priority, meeting_id):
+            if value:
+                params.append(value)
+        
+        cursor_kind = None
+        if after:
+            last_deadline, last_created_at, last_id = after
+            if last_deadline is not None:
+                cursor_kind = 'deadline'
+                params.extend([last_deadline, last_deadline, last_created_at, last_id])
+            else:
+                cursor_kind = 'null_deadline'
+                params.extend([last_created_at, last_id])
         
-        if status:
-            query += " AND t.status = %s"
-            params.append(status)
-        
-        if priority:
-            query += " AND t.priority = %s"
-            params.append(priority)
-        
-        if meeting_id:
-            query += " AND t.meeting_id = %s"
-            params.append(meeting_id)
-        
-        query += " ORDER BY t.deadline ASC NULLS LAST, t.created_at DESC"
+        # Fetch one extra row to know whether another page exists
+        params.append(limit + 1)
+        query = _TASKS_LIST_QUERIES[(bool(status), bool(priority), bool(meeting_id), cursor_kind)]
         
-        logger.info(f"🔍 Executing query with params: {params}")
+        logger.info("🔍 Executing query with params: %s", params)
         tasks = db.execute_query(query, params)
-        logger.info(f"✅ Found {len(tasks) if tasks else 0} tasks")
-        
-        # Format tasks
-        formatted_tasks = []
-        for task in tasks:
-            formatted_tasks.append({
-                'id': task['id'],
-                'meeting_id': task['meeting_id'],
-                'meeting_title': task['meeting_title'],
-                'title': task['title'],
-                'description': task['description'],
-                'assigned_to': task['assigned_to'],
-                'deadline': task['deadline'].isoformat() if task['deadline'] else None,
-                'priority': task['priority'],
-                'status': task['status'],
-                'calendar_event_id': task['calendar_event_id'],
-                'created_at': task['created_at'].isoformat() if task['created_at'] else None,
-                'updated_at': task['updated_at'].isoformat() if task['updated_at'] else None
-            })
-        
-        return jsonify({
-            'tasks': formatted_tasks,
-            'total': len(formatted_tasks),
+        logger.info("✅ Found %d tasks", len(tasks))
+        
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = _encode_cursor(tasks[-1])
+        
+        # Rows are projected to exactly the response fields; the app's orjson
+        # provider serializes them (datetimes included) without a per-row copy
+        payload = {
+            'tasks': tasks,
+            'total': len(tasks),
+            'limit': limit,
+            'next_cursor': next_cursor,
             'filters': {
                 'status': status,
                 'priority': priority,
                 'meeting_id': meeting_id
             }
-        }), 200
+        }
+        cache.set(cache_key, payload, TASKS_CACHE_TIMEOUT)
+        
+        return jsonify(payload), 200
         
     except Exception as e:
-        logger.error(f"❌ Error fetching tasks for user {user_id}: {str(e)}")
-        logger.error(f"❌ Full traceback: {traceback.format_exc()}")
+        logger.error("❌ Error fetching tasks for user %s: %s", user_id, e, exc_info=True)
         return jsonify({
             'error': f'Failed to get tasks: {str(e)}',
             'user_id': user_id,
@@ -96,34 +291,15 @@ def get_tasks():
 def get_task(task_id):
     """Get specific task details"""
     try:
-        query = """
-        SELECT t.*, m.title as meeting_title 
-        FROM tasks t
-        JOIN meetings m ON t.meeting_id = m.id
-        WHERE t.id = %s
-        """
-        
-        result = db.execute_query(query, (task_id,))
+        result = db.execute_query(TASK_DETAIL_QUERY, (task_id,))
         
         if not result:
             return jsonify({'error': 'Task not found'}), 404
         
-        task = result[0]
+        task = format_task(result[0])
+        task['meeting_title'] = result[0]['meeting_title']
         
-        return jsonify({
-            'id': task['id'],
-            'meeting_id': task['meeting_id'],
-            'meeting_title': task['meeting_title'],
-            'title': task['title'],
-            'description': task['description'],
-            'assigned_to': task['assigned_to'],
-            'deadline': task['deadline'].isoformat() if task['deadline'] else None,
-            'priority': task['priority'],
-            'status': task['status'],
-            'calendar_event_id': task['calendar_event_id'],
-            'created_at': task['created_at'].isoformat() if task['created_at'] else None,
-            'updated_at': task['updated_at'].isoformat() if task['updated_at'] else None
-        }), 200
+        return jsonify(task), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to get task: {str(e)}'}), 500
@@ -137,38 +313,25 @@ def update_task_status(task_id):
             return jsonify({'error': 'Status is required'}), 400
         
         new_status = data['status']
-        valid_statuses = ['pending', 'in_progress', 'completed']
         
-        if new_status not in valid_statuses:
-            return jsonify({'error': f'Invalid status. Must be one of: {valid_statuses}'}), 400
+        if new_status not in VALID_STATUSES:
+            return jsonify({'error': _STATUS_ERR}), 400
         
-        # Check if task exists
-        check_query = "SELECT id FROM tasks WHERE id = %s"
-        check_result = db.execute_query(check_query, (task_id,))
+        # Update task status; no row back means the task does not exist
+        updated = db.execute_query(UPDATE_TASK_STATUS_QUERY, (new_status, task_id))
         
-        if not check_result:
+        if not updated:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Update task status
-        update_query = """
-        UPDATE tasks 
-        SET status = %s, updated_at = %s 
-        WHERE id = %s
-        """
-        
-        updated_count = db.execute_query(update_query, (new_status, datetime.utcnow(), task_id))
-        
-        if updated_count > 0:
-            # Update calendar event if exists
-            calendar_result = calendar_service.update_task_status(task_id, new_status)
-            
-            return jsonify({
-                'success': True,
-                'message': f'Task status updated to {new_status}',
-                'calendar_updated': calendar_result.get('success', False)
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to update task status'}), 500
+        # Update calendar event (if any) in the background; the DB change is already committed
+        background_tasks.submit(get_calendar_service().update_task_status, task_id, new_status)
+        
+        return jsonify({
+            'success': True,
+            'message': f'Task status updated to {new_status}',
+            'calendar_updated': False,  # not yet confirmed; the sync runs in the background
+            'calendar_sync': 'pending'
+        }), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to update task status: {str(e)}'}), 500
@@ -181,96 +344,50 @@ def update_task(task_id):
         if not data:
             return jsonify({'error': 'Request data is required'}), 400
         
-        # Check if task exists
-        check_query = "SELECT * FROM tasks WHERE id = %s"
-        check_result = db.execute_query(check_query, (task_id,))
+        if not any(field in data for field in UPDATABLE_TASK_FIELDS):
+            return jsonify({'error': 'No valid fields to update'}), 400
         
-        if not check_result:
+        # One fixed statement for every field combination: absent fields are
+        # passed as NULL / not-set and keep their current value
+        deadline = None
+        if data.get('deadline'):
+            try:
+                deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00'))
+            except ValueError:
+                return jsonify({'error': 'Invalid deadline format. Use ISO format.'}), 400
+        
+        if 'priority' in data and data['priority'] not in VALID_PRIORITIES:
+            return jsonify({'error': _PRIORITY_ERR}), 400
+        
+        if 'status' in data and data['status'] not in VALID_STATUSES:
+            return jsonify({'error': _STATUS_ERR}), 400
+        
+        params = {
+            'title': data.get('title'),
+            'description_set': 'description' in data,
+            'description': data.get('description'),
+            'assigned_to_set': 'assigned_to' in data,
+            'assigned_to': data.get('assigned_to'),
+            'deadline_set': 'deadline' in data,
+            'deadline': deadline,
+            'priority': data.get('priority'),
+            'status': data.get('status'),
+            'task_id': task_id
+        }
+        
+        # Execute update and read back the row in the same statement
+        updated_task_result = db.execute_query(UPDATE_TASK_QUERY, params)
+        
+        if not updated_task_result:
             return jsonify({'error': 'Task not found'}), 404
         
-        current_task = check_result[0]
-        
-        # Build update query dynamically
-        update_fields = []
-        params = []
-        
-        if 'title' in data:
-            update_fields.append("title = %s")
-            params.append(data['title'])
+        updated_task = updated_task_result[0]
         
-        if 'description' in data:
-            update_fields.append("description = %s")
-            params.append(data['description'])
-        
-        if 'assigned_to' in data:
-            update_fields.append("assigned_to = %s")
-            params.append(data['assigned_to'])
-        
-        if 'deadline' in data:
-            if data['deadline']:
-                try:
-                    deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00'))
-                    update_fields.append("deadline = %s")
-                    params.append(deadline)
-                except ValueError:
-                    return jsonify({'error': 'Invalid deadline format. Use ISO format.'}), 400
-            else:
-                update_fields.append("deadline = NULL")
-        
-        if 'priority' in data:
-            valid_priorities = ['high', 'medium', 'low']
-            if data['priority'] not in valid_priorities:
-                return jsonify({'error': f'Invalid priority. Must be one of: {valid_priorities}'}), 400
-            update_fields.append("priority = %s")
-            params.append(data['priority'])
-        
-        if 'status' in data:
-            valid_statuses = ['pending', 'in_progress', 'completed']
-            if data['status'] not in valid_statuses:
-                return jsonify({'error': f'Invalid status. Must be one of: {valid_statuses}'}), 400
-            update_fields.append("status = %s")
-            params.append(data['status'])
-        
-        if not update_fields:
-            return jsonify({'error': 'No valid fields to update'}), 400
-        
-        # Add updated_at
-        update_fields.append("updated_at = %s")
-        params.append(datetime.utcnow())
-        
-        # Add task_id for WHERE clause
-        params.append(task_id)
-        
-        # Execute update
-        update_query = f"""
-        UPDATE tasks 
-        SET {', '.join(update_fields)}
-        WHERE id = %s
-        """
-        
-        updated_count = db.execute_query(update_query, params)
-        
-        if updated_count > 0:
-            # Get updated task
-            updated_task_result = db.execute_query(check_query, (task_id,))
-            updated_task = updated_task_result[0]
-            
-            return jsonify({
-                'success': True,
-                'message': 'Task updated successfully',
-                'task': {
-                    'id': updated_task['id'],
-                    'title': updated_task['title'],
-                    'description': updated_task['description'],
-                    'assigned_to': updated_task['assigned_to'],
-                    'deadline': updated_task['deadline'].isoformat() if updated_task['deadline'] else None,
-                    'priority': updated_task['priority'],
-                    'status': updated_task['status'],
-                    'updated_at': updated_task['updated_at'].isoformat() if updated_task['updated_at'] else None
-                }
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to update task'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Task updated successfully',
+            'task': format_task(updated_task)
+        }), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to update task: {str(e)}'}), 500
@@ -279,28 +396,21 @@ def update_task(task_id):
 def delete_task(task_id):
     """Delete a task"""
     try:
-        # Check if task exists
-        check_query = "SELECT id FROM tasks WHERE id = %s"
-        check_result = db.execute_query(check_query, (task_id,))
+        # Delete task; no row back means the task does not exist
+        deleted = db.execute_query(DELETE_TASK_QUERY, (task_id,))
         
-        if not check_result:
+        if not deleted:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Delete task
-        delete_query = "DELETE FROM tasks WHERE id = %s"
-        deleted_count = db.execute_query(delete_query, (task_id,))
-        
-        if deleted_count > 0:
-            # Delete calendar event if exists
-            calendar_result = calendar_service.delete_task_event(task_id)
-            
-            return jsonify({
-                'success': True,
-                'message': 'Task deleted successfully',
-                'calendar_deleted': calendar_result.get('success', False)
-            }), 200
-        else:
-            return jsonify({'error': 'Failed to delete task'}), 500
+        # Delete calendar event (if any) in the background
+        background_tasks.submit(get_calendar_service().delete_task_event, task_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Task deleted successfully',
+            'calendar_deleted': False,  # not yet confirmed; the sync runs in the background
+            'calendar_sync': 'pending'
+        }), 200
         
     except Exception as e:
         return jsonify({'error': f'Failed to delete task: {str(e)}'}), 500
@@ -315,45 +425,14 @@ def get_upcoming_tasks():
         
         days_ahead = int(request.args.get('days', 30))
         
-        query = """
-        SELECT t.*, m.title as meeting_title 
-        FROM tasks t
-        JOIN meetings m ON t.meeting_id = m.id
-        WHERE t.user_id = %s 
-        AND t.deadline IS NOT NULL 
-        AND t.deadline <= NOW() + INTERVAL '%s days'
-        AND t.status != 'completed'
-        ORDER BY t.deadline ASC
-        """
-        
-        tasks = db.execute_query(query, (user_id, days_ahead))
-        
-        # Format tasks
-        formatted_tasks = []
-        for task in tasks:
-            # Calculate days until deadline
-            if task['deadline']:
-                days_until = (task['deadline'].date() - datetime.now().date()).days
-            else:
-                days_until = None
-            
-            formatted_tasks.append({
-                'id': task['id'],
-                'meeting_id': task['meeting_id'],
-                'meeting_title': task['meeting_title'],
-                'title': task['title'],
-                'description': task['description'],
-                'assigned_to': task['assigned_to'],
-                'deadline': task['deadline'].isoformat() if task['deadline'] else None,
-                'days_until_deadline': days_until,
-                'priority': task['priority'],
-                'status': task['status'],
-                'is_overdue': days_until < 0 if days_until is not None else False
-            })
+        # Fetched in full before responding (the days window bounds it) so a database
+        # error becomes a 500 instead of a truncated 200 body. Rows already carry every
+        # response field, including the SQL-computed days_until_deadline / is_overdue
+        upcoming_tasks = db.execute_query(UPCOMING_TASKS_QUERY, (user_id, days_ahead))
         
         return jsonify({
-            'upcoming_tasks': formatted_tasks,
-            'total': len(formatted_tasks),
+            'upcoming_tasks': upcoming_tasks,
+            'total': len(upcoming_tasks),
             'days_ahead': days_ahead
         }), 200
         
@@ -368,58 +447,31 @@ def get_task_stats():
         if not user_id:
             return jsonify({'error': 'User ID is required'}), 400
         
-        stats = {}
-        
-        # Total tasks
-        total_query = """
-        SELECT COUNT(*) as count
-        FROM tasks t
-        WHERE t.user_id = %s
-        """
-        total_result = db.execute_query(total_query, (user_id,))
-        stats['total_tasks'] = total_result[0]['count'] if total_result else 0
-        
-        # Tasks by status
-        status_query = """
-        SELECT status, COUNT(*) as count
-        FROM tasks t
-        WHERE t.user_id = %s 
-        GROUP BY status
-        """
-        status_result = db.execute_query(status_query, (user_id,))
-        stats['by_status'] = {row['status']: row['count'] for row in status_result}
-        
-        # Tasks by priority
-        priority_query = """
-        SELECT priority, COUNT(*) as count
-        FROM tasks t
-        WHERE t.user_id = %s 
-        GROUP BY priority
-        """
-        priority_result = db.execute_query(priority_query, (user_id,))
-        stats['by_priority'] = {row['priority']: row['count'] for row in priority_result}
-        
-        # Overdue tasks
-        overdue_query = """
-        SELECT COUNT(*) as count
-        FROM tasks t
-        WHERE t.user_id = %s 
-        AND t.deadline < NOW() 
-        AND t.status != 'completed'
-        """
-        overdue_result = db.execute_query(overdue_query, (user_id,))
-        stats['overdue_tasks'] = overdue_result[0]['count'] if overdue_result else 0
-        
-        # Due this week
-        week_query = """
-        SELECT COUNT(*) as count
-        FROM tasks t
-        WHERE t.user_id = %s 
-        AND t.deadline BETWEEN NOW() AND NOW() + INTERVAL '7 days'
-        AND t.status != 'completed'
-        """
-        week_result = db.execute_query(week_query, (user_id,))
-        stats['due_this_week'] = week_result[0]['count'] if week_result else 0
+        # Read the version before the aggregates so a concurrent write can only
+        # make this entry unreachable, never leave stale stats under a new key
+        stats_key = f"task_stats:{user_id}:{_task_version(user_id)}"
+        cached = cache.get(stats_key)
+        if cached is not None:
+            return jsonify(cached), 200
+        
+        # All aggregates in one pass over the user's tasks
+        row = db.execute_query(TASK_STATS_QUERY, (user_id,))[0]
+        
+        stats = {
+            'total_tasks': row['total'],
+            'by_status': {
+                'pending': row['pending'],
+                'in_progress': row['in_progress'],
+                'completed': row['completed']
+            },
+            'by_priority': {
+                'high': row['p_high'],
+                'medium': row['p_medium'],
+                'low': row['p_low']
+            },
+            'overdue_tasks': row['overdue'],
+            'due_this_week': row['due_week']
+        }
         
         # Completion rate
         if stats['total_tasks'] > 0:
@@ -428,6 +480,8 @@ def get_task_stats():
         else:
             stats['completion_rate'] = 0
         
+        cache.set(stats_key, stats, TASKS_CACHE_TIMEOUT)
+        
         return jsonify(stats), 200
         
     except Exception as e:
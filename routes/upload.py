@@ -1,24 +1,71 @@
 from flask import Blueprint, request, jsonify
+import logging
 import os
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from werkzeug.utils import secure_filename
 
 from config.database import db
 from config.storage import storage
 from services.transcription import transcription_service
-from services.ai_processor import ai_processor
-from services.calendar_sync import calendar_service
+from services.ai_processor import get_ai_processor
+from services.calendar_sync import get_calendar_service
 from services.email_service import email_service
-from middleware.validation import validate_file_upload, validate_user_id, add_security_headers
+from services.background import pipeline_tasks
+from middleware.validation import validate_file_upload, validate_user_id, add_security_headers, RequestValidator
 
 upload_bp = Blueprint('upload', __name__)
 
-ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'mp4', 'webm'}
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = frozenset({'mp3', 'wav', 'm4a', 'mp4', 'webm'})
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot + 1:].lower() in ALLOWED_EXTENSIONS
+
+def _new_uuids(count: int):
+    """Return count random (version 4) UUID strings drawn from a single os.urandom call"""
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+def _utcnow():
+    """Current UTC time as a naive datetime (matches the TIMESTAMP columns)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _timeline_rows(meeting_id: str, entries):
+    """Build timeline insert rows; participants become a plain list of str (adapts to TEXT[])"""
+    rows = []
+    for entry in entries:
+        participants = entry.get('participants') or []
+        if isinstance(participants, str):
+            participants = [participants]
+        rows.append((
+            meeting_id,
+            entry.get('timestamp_minutes', 0),
+            entry.get('event_type', 'discussion'),
+            entry.get('title', ''),
+            entry.get('content', ''),
+            [str(p) for p in participants]
+        ))
+    return rows
+
+@lru_cache(maxsize=128)
+def _parse_deadline(value: str):
+    """Parse a YYYY-MM-DD task deadline into a midnight datetime; None if invalid"""
+    try:
+        d = date.fromisoformat(value)
+    except TypeError:
+        return None
+    except ValueError:
+        # fromisoformat needs zero-padded fields; strptime also takes e.g. 2024-1-5
+        try:
+            return datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            return None
+    return datetime(d.year, d.month, d.day)
 
 @upload_bp.route('/audio', methods=['POST'])
 @add_security_headers()
@@ -33,38 +80,44 @@ def upload_audio():
         meeting_title = request.form.get('title', 'Untitled Meeting')
         
         # Sanitize meeting title
-        from middleware.validation import RequestValidator
         meeting_title = RequestValidator.sanitize_string(meeting_title, 255)
         
         # Generate unique filename using validated info
         unique_filename = f"{user_id}/{uuid.uuid4()}.{file_info['file_extension']}"
         
-        # Read file data
-        file_data = file.read()
-        
-        print(f"📁 Uploading file: {file_info['original_filename']} ({file_info['file_size']} bytes)")
+        logger.info("📁 Uploading file: %s (%s bytes)", file_info['original_filename'], file_info['file_size'])
         
         # Upload to Supabase Storage
         audio_url = storage.upload_file(
             file_path=unique_filename,
-            file_data=file_data,
+            file_data=file.stream,  # streamed, not read into memory
             content_type=f'audio/{file_info["file_extension"]}'
         )
         
         if not audio_url:
             return jsonify({'error': 'Failed to upload file to storage'}), 500
         
-        print(f"☁️ File uploaded successfully: {audio_url}")
+        logger.info("☁️ File uploaded successfully: %s", audio_url)
         
         # user_id is now the database user ID (not Firebase UID)
-        print(f"📁 Creating meeting for database user ID: {user_id}")
+        logger.info("📁 Creating meeting for database user ID: %s", user_id)
         
         # Create meeting record in database
         meeting_id = str(uuid.uuid4())
         
+        # Insert the meeting and seed its processing status rows in one statement
+        # (one round-trip, one commit)
+        processing_steps = ['transcription', 'ai_analysis', 'task_extraction', 'calendar_sync']
+        
         insert_meeting_query = """
-        INSERT INTO meetings (id, user_id, title, audio_url, status, file_size, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        WITH m AS (
+            INSERT INTO meetings (id, user_id, title, audio_url, status, file_size, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        )
+        INSERT INTO processing_status (meeting_id, step, status, progress)
+        SELECT m.id, step, 'pending', 0
+        FROM m, unnest(%s::varchar[]) AS step
         """
         
         db.execute_query(insert_meeting_query, (
@@ -74,31 +127,17 @@ def upload_audio():
             audio_url,
             'processing',
             file_info['file_size'],
-            datetime.utcnow()
+            _utcnow(),
+            processing_steps
         ))
         
-        # Create initial processing status
-        processing_steps = ['transcription', 'ai_analysis', 'task_extraction', 'calendar_sync']
+        logger.info("💾 Meeting record created: %s", meeting_id)
+        logger.info("📊 Meeting details: title='%s', user_id='%s', status='processing'", meeting_title, user_id)
         
-        for step in processing_steps:
-            insert_status_query = """
-            INSERT INTO processing_status (meeting_id, step, status, progress)
-            VALUES (%s, %s, %s, %s)
-            """
-            db.execute_query(insert_status_query, (meeting_id, step, 'pending', 0))
-        
-        print(f"💾 Meeting record created: {meeting_id}")
-        print(f"📊 Meeting details: title='{meeting_title}', user_id='{user_id}', status='processing'")
-        
-        # Start processing pipeline asynchronously (in a real app, use Celery or similar)
-        # For now, we'll process synchronously but return immediately
-        try:
-            process_meeting_pipeline(meeting_id, audio_url, meeting_title)
-        except Exception as e:
-            print(f"❌ Processing pipeline error: {e}")
-            # Update meeting status to failed
-            update_meeting_query = "UPDATE meetings SET status = %s WHERE id = %s"
-            db.execute_query(update_meeting_query, ('failed', meeting_id))
+        # Run the processing pipeline on a background worker so the upload returns
+        # immediately; progress is reported through /status/<meeting_id>.
+        # process_meeting_pipeline marks the meeting failed on its own errors.
+        pipeline_tasks.submit(process_meeting_pipeline, meeting_id, audio_url, meeting_title, user_id)
         
         return jsonify({
             'success': True,
@@ -110,26 +149,43 @@ def upload_audio():
         }), 200
         
     except Exception as e:
-        print(f"❌ Upload error: {e}")
+        logger.error("❌ Upload error: %s", e)
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
-def process_meeting_pipeline(meeting_id: str, audio_url: str, meeting_title: str):
-    """Process the complete meeting pipeline"""
+def process_meeting_pipeline(meeting_id: str, audio_url: str, meeting_title: str, user_id: str):
+    """Process the complete meeting pipeline (user_id is the meeting owner's database ID)"""
+    
+    # Step status is kept in memory and written at phase transitions, so a step's
+    # "completed" and the next step's "processing" go out in one UPDATE
+    step_state = {}
     
     def update_processing_status(step: str, status: str, progress: int = 0, error: str = None):
-        """Update processing status in database"""
-        update_query = """
-        UPDATE processing_status 
-        SET status = %s, progress = %s, error_message = %s, 
-            completed_at = CASE WHEN %s = 'completed' THEN CURRENT_TIMESTAMP ELSE completed_at END
-        WHERE meeting_id = %s AND step = %s
+        """Record a step's status; written by flush_processing_status()"""
+        step_state[step] = (status, progress, error)
+    
+    def flush_processing_status(batch=None):
+        """Write all pending step status changes in a single UPDATE (queued on batch if given)"""
+        if not step_state:
+            return
+        rows = [(meeting_id, step, status, progress, error)
+                for step, (status, progress, error) in step_state.items()]
+        step_state.clear()
+        flush_query = """
+        UPDATE processing_status AS ps
+        SET status = v.status, progress = v.progress, error_message = v.error_message,
+            completed_at = CASE WHEN v.status = 'completed' THEN CURRENT_TIMESTAMP ELSE ps.completed_at END
+        FROM (VALUES %s) AS v(meeting_id, step, status, progress, error_message)
+        WHERE ps.meeting_id = v.meeting_id AND ps.step = v.step
         """
-        db.execute_query(update_query, (status, progress, error, status, meeting_id, step))
+        (batch or db).execute_values(flush_query, rows, template="(%s::uuid, %s, %s, %s::int, %s::text)")
     
     try:
+        ai_processor = get_ai_processor()
+        
         # Step 1: Transcription
-        print(f"🎵 Starting transcription for meeting {meeting_id}")
+        logger.info("🎵 Starting transcription for meeting %s", meeting_id)
         update_processing_status('transcription', 'processing', 10)
+        flush_processing_status()
         
         transcription_result = transcription_service.transcribe_audio(audio_url)
         
@@ -140,144 +196,147 @@ def process_meeting_pipeline(meeting_id: str, audio_url: str, meeting_title: str
         transcript = transcription_result['transcript']
         duration = transcription_result.get('duration', 0)
         
-        # Update meeting with transcript
-        update_meeting_query = """
-        UPDATE meetings SET transcript = %s, duration = %s, updated_at = %s 
-        WHERE id = %s
-        """
-        db.execute_query(update_meeting_query, (transcript, duration, datetime.utcnow(), meeting_id))
-        
-        update_processing_status('transcription', 'completed', 100)
-        print(f"✅ Transcription completed for meeting {meeting_id}")
+        logger.info("✅ Transcription completed for meeting %s", meeting_id)
         
         # Step 2: AI Analysis (Timeline)
-        print(f"🤖 Starting AI analysis for meeting {meeting_id}")
+        logger.info("🤖 Starting AI analysis for meeting %s", meeting_id)
+        update_processing_status('transcription', 'completed', 100)
         update_processing_status('ai_analysis', 'processing', 20)
         
-        timeline_result = ai_processor.extract_timeline(transcript, duration)
+        # Save the transcript and the step transition in one round-trip
+        with db.pipeline() as batch:
+            update_meeting_query = """
+            UPDATE meetings SET transcript = %s, duration = %s, updated_at = %s 
+            WHERE id = %s
+            """
+            batch.execute_query(update_meeting_query, (transcript, duration, _utcnow(), meeting_id))
+            flush_processing_status(batch)
+        
+        # Timeline, tasks and summary: one combined Gemini call when it can,
+        # otherwise timeline and tasks concurrently followed by the summary
+        analysis = ai_processor.process_meeting(transcript, duration, user_id)
+        
+        # The writes from here on have no slow external call between them (calendar
+        # sync is in-memory), so they share one pinned pool connection. The session
+        # is not held across transcription or Gemini, where an idle connection can
+        # be dropped by the server without psycopg2 noticing until the next write
+        with db.session():
+            timeline_result = analysis['timeline']
+        
+            if not timeline_result['success']:
+                update_processing_status('ai_analysis', 'failed', 0, timeline_result['error'])
+                raise Exception(f"Timeline extraction failed: {timeline_result['error']}")
+        
+            timeline_data = timeline_result['data']
+        
+            # Save timeline entries to database in one batch (VALUES list, or COPY when large)
+            if timeline_data.get('timeline'):
+                timeline_columns = ('meeting_id', 'timestamp_minutes', 'event_type', 'title', 'content', 'participants')
+                db.bulk_insert('timeline', timeline_columns,
+                               _timeline_rows(meeting_id, timeline_data['timeline']))
+        
+            update_processing_status('ai_analysis', 'completed', 100)
+            logger.info("✅ AI analysis completed for meeting %s", meeting_id)
+        
+            # Step 3: Task Extraction
+            logger.info("🎯 Starting task extraction for meeting %s", meeting_id)
+            update_processing_status('task_extraction', 'processing', 30)
+            flush_processing_status()
+        
+            tasks_result = analysis['tasks']
+        
+            if not tasks_result['success']:
+                update_processing_status('task_extraction', 'failed', 0, tasks_result['error'])
+                raise Exception(f"Task extraction failed: {tasks_result['error']}")
+        
+            tasks_data = tasks_result['data']
+        
+            # Save tasks to database
+            calendar_tasks = []
+            if tasks_data.get('tasks'):
+                task_rows = []
+                created_at = _utcnow()  # one timestamp for the whole batch
+                task_ids = _new_uuids(len(tasks_data['tasks']))
+                for task_id, task in zip(task_ids, tasks_data['tasks']):
+                    # Parse deadline (meetings tend to reuse the same few dates)
+                    deadline = _parse_deadline(task['deadline']) if task.get('deadline') else None
+                
+                    task_rows.append((
+                        task_id,
+                        meeting_id,
+                        user_id,
+                        task.get('title', ''),
+                        task.get('description', ''),
+                        task.get('assigned_to', ''),
+                        deadline,
+                        task.get('priority', 'medium'),
+                        task.get('status', 'pending'),
+                        created_at
+                    ))
+            
+                # All tasks in one batch (VALUES list, or COPY when large)
+                task_columns = ('id', 'meeting_id', 'user_id', 'title', 'description', 'assigned_to',
+                                'deadline', 'priority', 'status', 'created_at')
+                db.bulk_insert('tasks', task_columns, task_rows)
+            
+                # Calendar events carry the database task ID so later status
+                # updates and deletes can find them
+                calendar_tasks = [{**task, 'id': task_id} for task_id, task in zip(task_ids, tasks_data['tasks'])]
         
-        if not timeline_result['success']:
-            update_processing_status('ai_analysis', 'failed', 0, timeline_result['error'])
-            raise Exception(f"Timeline extraction failed: {timeline_result['error']}")
+            update_processing_status('task_extraction', 'completed', 100)
+            logger.info("✅ Task extraction completed for meeting %s", meeting_id)
         
-        timeline_data = timeline_result['data']
+            # Step 4: Calendar Sync
+            logger.info("📅 Starting calendar sync for meeting %s", meeting_id)
+            update_processing_status('calendar_sync', 'processing', 40)
+            flush_processing_status()
         
-        # Save timeline entries to database
-        if timeline_data.get('timeline'):
-            for entry in timeline_data['timeline']:
-                insert_timeline_query = """
-                INSERT INTO timeline (meeting_id, timestamp_minutes, event_type, title, content, participants)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """
-                db.execute_query(insert_timeline_query, (
-                    meeting_id,
-                    entry.get('timestamp_minutes', 0),
-                    entry.get('event_type', 'discussion'),
-                    entry.get('title', ''),
-                    entry.get('content', ''),
-                    entry.get('participants', [])
-                ))
-        
-        update_processing_status('ai_analysis', 'completed', 100)
-        print(f"✅ AI analysis completed for meeting {meeting_id}")
-        
-        # Step 3: Task Extraction
-        print(f"🎯 Starting task extraction for meeting {meeting_id}")
-        update_processing_status('task_extraction', 'processing', 30)
-        
-        tasks_result = ai_processor.extract_tasks(transcript, timeline_data)
-        
-        if not tasks_result['success']:
-            update_processing_status('task_extraction', 'failed', 0, tasks_result['error'])
-            raise Exception(f"Task extraction failed: {tasks_result['error']}")
-        
-        tasks_data = tasks_result['data']
-        
-        # Save tasks to database
-        task_ids = []
-        if tasks_data.get('tasks'):
-            for task in tasks_data['tasks']:
-                task_id = str(uuid.uuid4())
-                task_ids.append(task_id)
-                
-                # Parse deadline
-                deadline = None
-                if task.get('deadline'):
-                    try:
-                        deadline = datetime.strptime(task['deadline'], '%Y-%m-%d')
-                    except ValueError:
-                        deadline = None
-                
-                insert_task_query = """
-                INSERT INTO tasks (id, meeting_id, user_id, title, description, assigned_to, 
-                                 deadline, priority, status, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                # Get user_id from meeting
-                get_user_query = "SELECT user_id FROM meetings WHERE id = %s"
-                user_result = db.execute_query(get_user_query, (meeting_id,))
-                user_id = user_result[0]['user_id'] if user_result else None
-                
-                db.execute_query(insert_task_query, (
-                    task_id,
-                    meeting_id,
-                    user_id,
-                    task.get('title', ''),
-                    task.get('description', ''),
-                    task.get('assigned_to', ''),
-                    deadline,
-                    task.get('priority', 'medium'),
-                    task.get('status', 'pending'),
-                    datetime.utcnow()
-                ))
-        
-        update_processing_status('task_extraction', 'completed', 100)
-        print(f"✅ Task extraction completed for meeting {meeting_id}")
-        
-        # Step 4: Calendar Sync
-        print(f"📅 Starting calendar sync for meeting {meeting_id}")
-        update_processing_status('calendar_sync', 'processing', 40)
-        
-        if tasks_data.get('tasks'):
-            calendar_result = calendar_service.create_task_events(tasks_data['tasks'], meeting_title)
+            if calendar_tasks:
+                calendar_result = get_calendar_service().create_task_events(calendar_tasks, meeting_title)
             
-            if not calendar_result['success']:
-                update_processing_status('calendar_sync', 'failed', 0, calendar_result['error'])
-                print(f"⚠️ Calendar sync failed: {calendar_result['error']}")
+                if not calendar_result['success']:
+                    update_processing_status('calendar_sync', 'failed', 0, calendar_result['error'])
+                    logger.warning("⚠️ Calendar sync failed: %s", calendar_result['error'])
+                else:
+                    update_processing_status('calendar_sync', 'completed', 100)
+                    logger.info("✅ Calendar sync completed for meeting %s", meeting_id)
             else:
                 update_processing_status('calendar_sync', 'completed', 100)
-                print(f"✅ Calendar sync completed for meeting {meeting_id}")
-        else:
-            update_processing_status('calendar_sync', 'completed', 100)
-            print(f"✅ Calendar sync completed (no tasks to sync) for meeting {meeting_id}")
-        
-        # Generate meeting summary
-        summary_result = ai_processor.generate_meeting_summary(transcript, timeline_data, tasks_data)
-        if summary_result['success']:
-            summary_text = str(summary_result['data'])
-            update_summary_query = "UPDATE meetings SET summary = %s WHERE id = %s"
-            db.execute_query(update_summary_query, (summary_text, meeting_id))
-        
-        # Update overall meeting status
-        update_meeting_query = "UPDATE meetings SET status = %s, updated_at = %s WHERE id = %s"
-        db.execute_query(update_meeting_query, ('completed', datetime.utcnow(), meeting_id))
+                logger.info("✅ Calendar sync completed (no tasks to sync) for meeting %s", meeting_id)
+        
+            summary_result = analysis['summary']
+            summary_text = str(summary_result['data']) if summary_result['success'] else None
+        
+            # Store the calendar step status, the summary (if any) and the final
+            # meeting status in one round-trip
+            with db.pipeline() as batch:
+                flush_processing_status(batch)
+                update_meeting_query = """
+                UPDATE meetings SET summary = COALESCE(%s, summary), status = %s, updated_at = %s
+                WHERE id = %s
+                """
+                batch.execute_query(update_meeting_query, (summary_text, 'completed', _utcnow(), meeting_id))
         
-        print(f"🎉 Complete processing pipeline finished for meeting {meeting_id}")
+        logger.info("🎉 Complete processing pipeline finished for meeting %s", meeting_id)
         
         # Step 5: Send Email Notification
-        print(f"📧 Sending email notification for meeting {meeting_id}")
+        logger.info("📧 Sending email notification for meeting %s", meeting_id)
         try:
             send_meeting_email_notification(meeting_id)
         except Exception as email_error:
-            print(f"⚠️ Email notification failed for meeting {meeting_id}: {email_error}")
+            logger.warning("⚠️ Email notification failed for meeting %s: %s", meeting_id, email_error)
             # Don't fail the entire process if email fails
         
     except Exception as e:
-        print(f"❌ Pipeline error for meeting {meeting_id}: {e}")
+        logger.error("❌ Pipeline error for meeting %s: %s", meeting_id, e)
+        # Write the failed step's status before marking the meeting failed
+        try:
+            flush_processing_status()
+        except Exception as flush_error:
+            logger.warning("⚠️ Failed to write processing status for meeting %s: %s", meeting_id, flush_error)
         # Update meeting status to failed
         update_meeting_query = "UPDATE meetings SET status = %s, updated_at = %s WHERE id = %s"
-        db.execute_query(update_meeting_query, ('failed', datetime.utcnow(), meeting_id))
+        db.execute_query(update_meeting_query, ('failed', _utcnow(), meeting_id))
 
 @upload_bp.route('/status/<meeting_id>', methods=['GET', 'OPTIONS'])
 @add_security_headers()
@@ -293,18 +352,20 @@ def get_processing_status(meeting_id):
             response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
             return response
         # Validate meeting_id format
-        from middleware.validation import RequestValidator
         if not RequestValidator.validate_uuid(meeting_id):
             return jsonify({'error': 'Invalid meeting ID format'}), 400
         
-        print(f"🔍 Getting processing status for meeting: {meeting_id}")
+        logger.info("🔍 Getting processing status for meeting: %s", meeting_id)
         
-        # Get meeting info
-        meeting_query = "SELECT * FROM meetings WHERE id = %s"
+        # Get meeting info (timestamps are formatted as ISO strings by Postgres)
+        meeting_query = """
+        SELECT title, status, to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS created_at
+        FROM meetings WHERE id = %s
+        """
         meeting_result = db.execute_query(meeting_query, (meeting_id,))
         
         if not meeting_result:
-            print(f"❌ Meeting not found: {meeting_id}")
+            logger.warning("❌ Meeting not found: %s", meeting_id)
             return jsonify({
                 'error': 'Meeting not found',
                 'meeting_id': meeting_id,
@@ -313,33 +374,30 @@ def get_processing_status(meeting_id):
         
         meeting = meeting_result[0]
         
-        # Get processing status
-        status_query = "SELECT * FROM processing_status WHERE meeting_id = %s ORDER BY started_at"
+        # Get processing status, already shaped like the response items
+        status_query = """
+        SELECT step, status, progress, error_message,
+               to_char(started_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS started_at,
+               to_char(completed_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS completed_at
+        FROM processing_status
+        WHERE meeting_id = %s
+        ORDER BY processing_status.started_at
+        """
         status_result = db.execute_query(status_query, (meeting_id,))
         
-        print(f"✅ Found meeting: {meeting['title']} (status: {meeting['status']})")
-        print(f"✅ Found {len(status_result) if status_result else 0} processing steps")
+        logger.info("✅ Found meeting: %s (status: %s)", meeting['title'], meeting['status'])
+        logger.info("✅ Found %s processing steps", len(status_result) if status_result else 0)
         
         return jsonify({
             'meeting_id': meeting_id,
             'meeting_status': meeting['status'],
             'title': meeting['title'],
-            'created_at': meeting['created_at'].isoformat() if meeting['created_at'] else None,
-            'processing_steps': [
-                {
-                    'step': step['step'],
-                    'status': step['status'],
-                    'progress': step['progress'],
-                    'error_message': step['error_message'],
-                    'started_at': step['started_at'].isoformat() if step['started_at'] else None,
-                    'completed_at': step['completed_at'].isoformat() if step['completed_at'] else None
-                }
-                for step in (status_result or [])
-            ]
+            'created_at': meeting['created_at'],
+            'processing_steps': status_result or []
         }), 200
         
     except Exception as e:
-        print(f"❌ Error getting status for meeting {meeting_id}: {e}")
+        logger.error("❌ Error getting status for meeting %s: %s", meeting_id, e)
         return jsonify({'error': f'Failed to get status: {str(e)}'}), 500
 
 @upload_bp.route('/meetings', methods=['GET'])
@@ -347,32 +405,21 @@ def get_processing_status(meeting_id):
 def list_recent_meetings():
     """List recent meetings for debugging"""
     try:
-        # Get recent meetings
+        # Get recent meetings, already shaped like the response items
         query = """
-        SELECT id, title, status, created_at, user_id 
+        SELECT id, title, status, to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS created_at, user_id 
         FROM meetings 
-        ORDER BY created_at DESC 
+        ORDER BY meetings.created_at DESC 
         LIMIT 10
         """
         meetings = db.execute_query(query)
         
-        print(f"📋 Found {len(meetings) if meetings else 0} recent meetings")
+        logger.info("📋 Found %s recent meetings", len(meetings) if meetings else 0)
         
-        return jsonify({
-            'meetings': [
-                {
-                    'id': meeting['id'],
-                    'title': meeting['title'],
-                    'status': meeting['status'],
-                    'created_at': meeting['created_at'].isoformat() if meeting['created_at'] else None,
-                    'user_id': meeting['user_id']
-                }
-                for meeting in (meetings or [])
-            ]
-        }), 200
+        return jsonify({'meetings': meetings or []}), 200
         
     except Exception as e:
-        print(f"❌ Error listing meetings: {e}")
+        logger.error("❌ Error listing meetings: %s", e)
         return jsonify({'error': f'Failed to list meetings: {str(e)}'}), 500
 
 def send_meeting_email_notification(meeting_id: str):
@@ -380,80 +427,75 @@ def send_meeting_email_notification(meeting_id: str):
     Send email notification to user with meeting summary, timeline, and tasks
     """
     try:
-        # Get meeting data and user preferences
-        meeting_query = """
-        SELECT m.*, u.email, u.name, u.email_notifications 
-        FROM meetings m 
-        JOIN users u ON m.user_id = u.id 
-        WHERE m.id = %s
+        # Cheapest gate first: the owner's contact details and email preference only
+        user_query = """
+        SELECT email, name, email_notifications 
+        FROM users 
+        WHERE id = (SELECT user_id FROM meetings WHERE id = %s)
         """
-        meeting_result = db.execute_query(meeting_query, (meeting_id,))
+        user_result = db.execute_query(user_query, (meeting_id,))
         
-        if not meeting_result:
-            print(f"❌ Meeting {meeting_id} not found for email notification")
+        if not user_result:
+            logger.error("❌ Meeting %s not found for email notification", meeting_id)
             return
         
-        meeting_data = meeting_result[0]
-        user_email = meeting_data['email']
-        user_name = meeting_data['name']
-        email_notifications_enabled = meeting_data['email_notifications']
+        user_email = user_result[0]['email']
+        user_name = user_result[0]['name']
         
         # Check if user has email notifications enabled
-        if not email_notifications_enabled:
-            print(f"📧 Email notifications disabled for user {user_email}, skipping email for meeting {meeting_id}")
+        if not user_result[0]['email_notifications']:
+            logger.info("📧 Email notifications disabled for user %s, skipping email for meeting %s", user_email, meeting_id)
             return
         
-        # Get timeline data
-        timeline_query = """
-        SELECT * FROM timeline 
-        WHERE meeting_id = %s 
-        ORDER BY timestamp_minutes ASC
-        """
-        timeline_result = db.execute_query(timeline_query, (meeting_id,))
-        timeline_data = timeline_result or []
-        
-        # Get tasks data
-        tasks_query = """
-        SELECT * FROM tasks 
-        WHERE meeting_id = %s 
-        ORDER BY priority DESC, created_at ASC
+        # Get the meeting fields used by the email, its timeline and its tasks in one
+        # round-trip, already shaped (and formatted) the way the email service expects
+        meeting_query = """
+        SELECT json_build_object(
+                   'id', m.id,
+                   'title', m.title,
+                   'duration', m.duration,
+                   'created_at', to_char(m.created_at, 'YYYY-MM-DD HH24:MI'),
+                   'status', m.status
+               ) AS meeting,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                              'timestamp', to_char(FLOOR(t.timestamp_minutes), 'FM9999900') || ':' ||
+                                  to_char(FLOOR((t.timestamp_minutes - FLOOR(t.timestamp_minutes)) * 60), 'FM00'),
+                              'timestamp_minutes', COALESCE(t.timestamp_minutes, 0)::float8,
+                              'event_type', t.event_type,
+                              'title', t.title,
+                              'content', t.content,
+                              'participants', COALESCE(t.participants, '{}'::text[])
+                          ) ORDER BY t.timestamp_minutes ASC)
+                   FROM timeline t
+                   WHERE t.meeting_id = m.id
+               ), '[]'::json) AS timeline,
+               COALESCE((
+                   SELECT json_agg(json_build_object(
+                              'title', tk.title,
+                              'description', tk.description,
+                              'assigned_to', tk.assigned_to,
+                              'deadline', to_char(tk.deadline, 'YYYY-MM-DD'),
+                              'priority', tk.priority,
+                              'status', tk.status
+                          ) ORDER BY tk.priority DESC, tk.created_at ASC)
+                   FROM tasks tk
+                   WHERE tk.meeting_id = m.id
+               ), '[]'::json) AS tasks
+        FROM meetings m
+        WHERE m.id = %s
         """
-        tasks_result = db.execute_query(tasks_query, (meeting_id,))
-        tasks_data = tasks_result or []
-        
-        # Convert data to proper format for email
-        formatted_meeting_data = {
-            'id': meeting_data['id'],
-            'title': meeting_data['title'],
-            'duration': meeting_data['duration'],
-            'created_at': meeting_data['created_at'].strftime('%Y-%m-%d %H:%M') if meeting_data['created_at'] else None,
-            'status': meeting_data['status']
-        }
-        
-        formatted_timeline_data = []
-        for item in timeline_data:
-            formatted_timeline_data.append({
-                'timestamp': item['timestamp'],
-                'timestamp_minutes': float(item['timestamp_minutes']) if item['timestamp_minutes'] else 0,
-                'event_type': item['event_type'],
-                'title': item['title'],
-                'content': item['content'],
-                'participants': item['participants'] if item['participants'] else []
-            })
-        
-        formatted_tasks_data = []
-        for task in tasks_data:
-            formatted_tasks_data.append({
-                'title': task['title'],
-                'description': task['description'],
-                'assigned_to': task['assigned_to'],
-                'deadline': task['deadline'].strftime('%Y-%m-%d') if task['deadline'] else None,
-                'priority': task['priority'],
-                'status': task['status']
-            })
-        
-        # Send email
-        success = email_service.send_meeting_summary_email(
+        meeting_result = db.execute_query(meeting_query, (meeting_id,))
+        if not meeting_result:
+            logger.error("❌ Meeting %s not found for email notification", meeting_id)
+            return
+        
+        formatted_meeting_data = meeting_result[0]['meeting']
+        formatted_timeline_data = meeting_result[0]['timeline']
+        formatted_tasks_data = meeting_result[0]['tasks']
+        
+        # Queue the email; the pipeline worker doesn't wait on SMTP
+        future = email_service.send_meeting_summary_email_async(
             user_email=user_email,
             user_name=user_name,
             meeting_data=formatted_meeting_data,
@@ -461,11 +503,14 @@ def send_meeting_email_notification(meeting_id: str):
             tasks_data=formatted_tasks_data
         )
         
-        if success:
-            print(f"✅ Email notification sent successfully to {user_email} for meeting {meeting_id}")
-        else:
-            print(f"❌ Failed to send email notification to {user_email} for meeting {meeting_id}")
+        def log_result(f):
+            if not f.exception() and f.result():
+                logger.info("✅ Email notification sent successfully to %s for meeting %s", user_email, meeting_id)
+            else:
+                logger.error("❌ Failed to send email notification to %s for meeting %s", user_email, meeting_id)
+        
+        future.add_done_callback(log_result)
             
     except Exception as e:
-        print(f"❌ Error sending email notification for meeting {meeting_id}: {str(e)}")
+        logger.error("❌ Error sending email notification for meeting %s: %s", meeting_id, e)
         raise e
@@ -0,0 +1,42 @@
+"""
+Background task runner
+Runs slow side effects (calendar sync, etc.) off the request thread
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+class BackgroundTasks:
+    def __init__(self, max_workers: int, name: str = 'background'):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                           thread_name_prefix=name)
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Schedule func(*args, **kwargs); failures are logged instead of lost"""
+        future = self.executor.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda f: self._log_failure(f, func))
+        return future
+
+    @staticmethod
+    def _log_failure(future: Future, func: Callable):
+        """Log an exception raised by a background task"""
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Background task %s failed: %s", getattr(func, '__qualname__', func), exc,
+                         exc_info=exc)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for queued tasks"""
+        self.executor.shutdown(wait=wait)
+
+# Global runner for short side effects (calendar sync, etc.)
+background_tasks = BackgroundTasks(int(os.getenv('BACKGROUND_WORKERS', '4')))
+
+# Separate runner for minutes-long meeting pipelines so they never starve
+# the short side effects above
+pipeline_tasks = BackgroundTasks(int(os.getenv('PIPELINE_WORKERS', '2')), name='pipeline')
@@ -1,33 +1,76 @@
-import os
-import json
+import bisect
+import itertools
+import threading
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import requests
+
+# Title prefix shown for each task status
+STATUS_EMOJI = {
+    'completed': '✅',
+    'in_progress': '🔄',
+}
+
+_START_EPOCH = itemgetter('start_epoch')
+
+# Bookkeeping fields kept on stored events but never returned to callers
+_INTERNAL_EVENT_FIELDS = frozenset({'base_title', 'start_epoch'})
+
+def _public_event(event: Dict) -> Dict:
+    """Copy of a stored event without its internal bookkeeping fields"""
+    return {k: v for k, v in event.items() if k not in _INTERNAL_EVENT_FIELDS}
+
+# Deadline formats tried after ISO 8601 (which covers YYYY-MM-DD and YYYY-MM-DD HH:MM:SS)
+DEADLINE_FALLBACK_FORMATS = ('%m/%d/%Y', '%d %B %Y', '%B %d, %Y')
+
+@lru_cache(maxsize=256)
+def _parse_deadline(value: Optional[str]) -> Optional[datetime]:
+    """Parse a task deadline string (ISO fast path, then fallback formats); None if unparseable"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in DEADLINE_FALLBACK_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
 
 class CalendarSyncService:
     def __init__(self):
         # For now, we'll implement a simple calendar service
         # In production, you can integrate with Google Calendar, Outlook, etc.
         self.calendar_events = []  # In-memory storage for demo
+        # task_id -> that task's events, so status updates/deletes skip the full scan
+        self._by_task_id: Dict[str, List[Dict]] = {}
+        # Events ordered by start_epoch, so upcoming lookups are a bisect + slice
+        self._by_start: List[Dict] = []
+        self._event_ids = itertools.count(1)
+        self._lock = threading.Lock()
     
     def create_task_events(self, tasks: List[Dict], meeting_title: str) -> Dict:
         """
         Create calendar events for extracted tasks
         """
         try:
-            created_events = []
-            
-            for task in tasks:
-                event = self._create_calendar_event(task, meeting_title)
-                if event:
-                    created_events.append(event)
+            # Build every event first, then store the batch under one lock (and,
+            # with a remote calendar, one batched API request)
+            created_events = [
+                event for event in (self._build_calendar_event(task, meeting_title) for task in tasks)
+                if event
+            ]
+            self._store_events(created_events)
             
             print(f"📅 Created {len(created_events)} calendar events")
             
             return {
                 'success': True,
                 'events_created': len(created_events),
-                'events': created_events
+                'events': [_public_event(event) for event in created_events]
             }
             
         except Exception as e:
@@ -40,28 +83,45 @@ class CalendarSyncService:
         """
         Create a single calendar event for a task
         """
+        event = self._build_calendar_event(task, meeting_title)
+        if event:
+            self._store_events([event])
+        return event
+    
+    def _store_events(self, events: List[Dict]):
+        """Add built events to in-memory storage and its indexes"""
+        if not events:
+            return
+        with self._lock:
+            self.calendar_events.extend(events)
+            for event in events:
+                bisect.insort(self._by_start, event, key=_START_EPOCH)
+                if event['task_id'] is not None:
+                    self._by_task_id.setdefault(event['task_id'], []).append(event)
+    
+    def _build_calendar_event(self, task: Dict, meeting_title: str) -> Optional[Dict]:
+        """
+        Build the calendar event for a task (not stored)
+        """
         try:
             # Parse deadline
-            deadline_str = task.get('deadline')
-            if deadline_str:
-                try:
-                    deadline = datetime.strptime(deadline_str, '%Y-%m-%d')
-                except ValueError:
-                    # Try different date formats
-                    try:
-                        deadline = datetime.strptime(deadline_str, '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        deadline = datetime.now() + timedelta(days=7)  # Default to 1 week
-            else:
-                deadline = datetime.now() + timedelta(days=7)
+            deadline = _parse_deadline(task.get('deadline'))
+            if deadline is None:
+                deadline = datetime.now() + timedelta(days=7)  # Default to 1 week
             
-            # Create event data
+            # Create event data (base_title is the title without its status emoji).
+            # start_time/end_time are ISO strings; start_epoch is kept for cheap
+            # comparisons so the strings never need re-parsing
+            base_title = task.get('title', 'Untitled Task')
+            start_time = deadline.replace(hour=9, minute=0)  # Default to 9 AM
             event = {
-                'id': f"task_{len(self.calendar_events) + 1}",
-                'title': f"📋 {task.get('title', 'Untitled Task')}",
+                'id': f"task_{next(self._event_ids)}",
+                'title': f"📋 {base_title}",
+                'base_title': base_title,
                 'description': self._format_task_description(task, meeting_title),
-                'start_time': deadline.replace(hour=9, minute=0),  # Default to 9 AM
-                'end_time': deadline.replace(hour=10, minute=0),   # 1 hour duration
+                'start_time': start_time.isoformat(),
+                'end_time': deadline.replace(hour=10, minute=0).isoformat(),  # 1 hour duration
+                'start_epoch': start_time.timestamp(),
                 'all_day': False,
                 'priority': task.get('priority', 'medium'),
                 'assigned_to': task.get('assigned_to', 'Unassigned'),
@@ -70,13 +130,10 @@ class CalendarSyncService:
                 'created_at': datetime.now().isoformat()
             }
             
-            # Add to our in-memory storage
-            self.calendar_events.append(event)
-            
             return event
             
         except Exception as e:
-            print(f"❌ Error creating calendar event: {e}")
+            print(f"❌ Error building calendar event: {e}")
             return None
     
     def _format_task_description(self, task: Dict, meeting_title: str) -> str:
@@ -111,43 +168,35 @@ class CalendarSyncService:
         """
         Get upcoming task events
         """
-        cutoff_date = datetime.now() + timedelta(days=days_ahead)
-        
-        upcoming = [
-            event for event in self.calendar_events
-            if datetime.fromisoformat(event['start_time'].replace('Z', '+00:00')) <= cutoff_date
-        ]
-        
-        # Sort by start time
-        upcoming.sort(key=lambda x: x['start_time'])
+        cutoff = (datetime.now() + timedelta(days=days_ahead)).timestamp()
         
-        return upcoming
+        # Already sorted by start time; everything up to the cutoff is upcoming
+        with self._lock:
+            upcoming = self._by_start[:bisect.bisect_right(self._by_start, cutoff, key=_START_EPOCH)]
+            return [_public_event(event) for event in upcoming]
     
     def update_task_status(self, task_id: str, status: str) -> Dict:
         """
         Update task status in calendar
         """
         try:
-            for event in self.calendar_events:
-                if event.get('task_id') == task_id:
-                    # Update event title to reflect status
-                    if status == 'completed':
-                        event['title'] = f"✅ {event['title'].replace('📋 ', '').replace('✅ ', '')}"
-                    elif status == 'in_progress':
-                        event['title'] = f"🔄 {event['title'].replace('📋 ', '').replace('🔄 ', '')}"
-                    else:
-                        event['title'] = f"📋 {event['title'].replace('📋 ', '').replace('✅ ', '').replace('🔄 ', '')}"
-                    
-                    event['updated_at'] = datetime.now().isoformat()
-                    
+            with self._lock:
+                events = self._by_task_id.get(task_id)
+                if not events:
                     return {
-                        'success': True,
-                        'message': f'Task status updated to {status}'
+                        'success': False,
+                        'error': 'Task not found in calendar'
                     }
+                
+                # Update event title to reflect status
+                event = events[0]
+                emoji = STATUS_EMOJI.get(status, '📋')
+                event['title'] = f"{emoji} {event['base_title']}"
+                event['updated_at'] = datetime.now().isoformat()
             
             return {
-                'success': False,
-                'error': 'Task not found in calendar'
+                'success': True,
+                'message': f'Task status updated to {status}'
             }
             
         except Exception as e:
@@ -161,13 +210,17 @@ class CalendarSyncService:
         Delete task event from calendar
         """
         try:
-            original_count = len(self.calendar_events)
-            self.calendar_events = [
-                event for event in self.calendar_events
-                if event.get('task_id') != task_id
-            ]
+            with self._lock:
+                events = self._by_task_id.pop(task_id, [])
+                for event in events:
+                    self.calendar_events.remove(event)
+                    # Find the event among those sharing its start time
+                    i = bisect.bisect_left(self._by_start, event['start_epoch'], key=_START_EPOCH)
+                    while self._by_start[i] is not event:
+                        i += 1
+                    del self._by_start[i]
             
-            deleted_count = original_count - len(self.calendar_events)
+            deleted_count = len(events)
             
             return {
                 'success': True,
@@ -205,8 +258,8 @@ class CalendarSyncService:
             'message': 'Using in-memory calendar for demo purposes'
         }
     
-    def get_calendar_health(self) -> Dict:
-        """Check if calendar service is healthy"""
+    def get_calendar_health(self, mode: str = 'deep') -> Dict:
+        """Check if calendar service is healthy (in-memory, so both modes are equally cheap)"""
         try:
             return {
                 'service': 'calendar_sync',
@@ -229,12 +282,26 @@ class CalendarSyncService:
     def export_calendar_data(self) -> Dict:
         """
         Export calendar data for debugging or migration
+        The events list is a snapshot of copies, not the live storage.
         """
+        with self._lock:
+            events = [_public_event(event) for event in self._by_start]
+        
         return {
-            'total_events': len(self.calendar_events),
-            'events': self.calendar_events,
+            'total_events': len(events),
+            'events': events,
             'export_timestamp': datetime.now().isoformat()
         }
 
-# Global calendar sync service instance
-calendar_service = CalendarSyncService()
+# Global calendar sync service instance, built on first use
+_calendar_service = None
+_calendar_service_lock = threading.Lock()
+
+def get_calendar_service() -> CalendarSyncService:
+    """Return the shared CalendarSyncService, creating it once (thread-safe)"""
+    global _calendar_service
+    if _calendar_service is None:
+        with _calendar_service_lock:
+            if _calendar_service is None:
+                _calendar_service = CalendarSyncService()
+    return _calendar_service
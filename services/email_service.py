@@ -3,19 +3,120 @@ Email Service for AI Meeting Assistant
 Handles sending meeting summaries, timelines, and task notifications to users
 """
 
+import atexit
 import os
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import ssl
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from email import policy
+from email.message import EmailMessage
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from jinja2 import Template
+import tempfile
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup
 import logging
 
+from services.liveness import check_tcp_liveness
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Autoescape runs markupsafe.escape for every {{ }} in the templates; make sure
+# the C implementation is the one in use
+try:
+    import markupsafe._speedups  # noqa: F401
+except ImportError:
+    logger.warning("MarkupSafe C speedups unavailable; email template escaping will use the slow pure-Python path")
+
+# Email templates live in templates/email/ and are compiled once at import;
+# sends only call render()
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'templates', 'email')
+
+# Compiled template code is also cached on disk, so restarted workers skip the
+# Jinja lexer/parser/codegen entirely
+_BYTECODE_CACHE_DIR = os.getenv('EMAIL_TEMPLATE_CACHE_DIR',
+                                os.path.join(tempfile.gettempdir(), 'jinja_email_cache'))
+os.makedirs(_BYTECODE_CACHE_DIR, exist_ok=True)
+
+_ENV = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    bytecode_cache=FileSystemBytecodeCache(directory=_BYTECODE_CACHE_DIR),
+    auto_reload=False,
+    cache_size=50,
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+_MEETING_SUMMARY_TMPL = _ENV.get_template('meeting_summary.html')
+_TASK_REMINDER_TMPL = _ENV.get_template('task_reminder.html')
+
+# Priority/status badge markup for every known combination, built once so the task
+# loop does a dict lookup instead of filter chains (unknown values fall back in the template)
+_TASK_BADGES = {
+    (priority, status): Markup(
+        f'<span class="task-priority priority-{priority}">{priority.upper()}</span>\n'
+        f'<span class="task-status status-{status}">{status.replace("_", " ").title()}</span>'
+    )
+    for priority in ('high', 'medium', 'low')
+    for status in ('pending', 'in_progress', 'completed')
+}
+
+@lru_cache(maxsize=1)
+def _format_minute(minute: int) -> str:
+    """Format an epoch minute as local 'YYYY-MM-DD HH:MM'"""
+    return datetime.fromtimestamp(minute * 60).strftime('%Y-%m-%d %H:%M')
+
+def _now_minute_label() -> str:
+    """Current local time for emails without a meeting date; strftime runs once per minute"""
+    return _format_minute(int(time.time() // 60))
+
+# Separator printed after each timeline item in the plain-text summary
+_TIMELINE_ITEM_RULE = "\n" + "-" * 50 + "\n\n"
+
+# SMTP line endings (CRLF) so serialized bytes go to sendmail() as-is; 7bit keeps
+# non-ASCII bodies/headers transfer-encoded so no 8BITMIME/SMTPUTF8 is needed
+_EMAIL_POLICY = policy.SMTP.clone(cte_type='7bit')
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """TLS client context that offers the most recent SMTP session for resumption"""
+
+    last_session = None
+
+    def wrap_socket(self, sock, *args, session=None, **kwargs):
+        return super().wrap_socket(sock, *args, session=session or self.last_session, **kwargs)
+
+# Built once (CA store loaded once) and shared by every STARTTLS so reconnects
+# can use an abbreviated handshake
+_SSL_CTX = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_SSL_CTX.load_default_certs()
+_SSL_CTX.options &= ~ssl.OP_NO_TICKET
+
+class _PooledSMTP:
+    """One pool slot: an SMTP session (or None until first use) and its message count"""
+
+    __slots__ = ('server', 'sent')
+
+    def __init__(self):
+        self.server = None
+        self.sent = 0
+
+    def close(self):
+        """Quit the session, if any, so the next checkout reconnects"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server = None
+        self.sent = 0
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -23,6 +124,20 @@ class EmailService:
         self.email_address = os.getenv('EMAIL_ADDRESS')
         self.email_password = os.getenv('EMAIL_PASSWORD')
         self.from_name = os.getenv('FROM_NAME', 'AI Meeting Assistant')
+        # Set to false to send HTML only and skip rendering the text/plain alternative
+        self.include_plaintext = os.getenv('EMAIL_INCLUDE_PLAINTEXT', 'true').lower() == 'true'
+        
+        # Fixed-size pool of authenticated SMTP sessions, connected lazily on
+        # first checkout and rotated every max_messages_per_connection messages
+        self.pool_size = int(os.getenv('SMTP_POOL_SIZE', '5'))
+        self.max_messages_per_connection = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+        self._pool = Queue(maxsize=self.pool_size)
+        for _ in range(self.pool_size):
+            self._pool.put(_PooledSMTP())
+        
+        # Render + send off the caller's thread so callers never wait on SMTP
+        self._executor = ThreadPoolExecutor(max_workers=int(os.getenv('EMAIL_WORKERS', '4')),
+                                            thread_name_prefix='email')
         
         if not self.email_address or not self.email_password:
             logger.warning("Email credentials not configured. Email notifications will be disabled.")
@@ -46,7 +161,7 @@ class EmailService:
 
         try:
             # Create email message
-            msg = MIMEMultipart('alternative')
+            msg = EmailMessage(policy=_EMAIL_POLICY)
             msg['Subject'] = f"Meeting Summary: {meeting_data.get('title', 'Untitled Meeting')}"
             msg['From'] = f"{self.from_name} <{self.email_address}>"
             msg['To'] = user_email
@@ -56,17 +171,16 @@ class EmailService:
                 user_name, meeting_data, timeline_data, tasks_data
             )
             
-            # Generate plain text content
-            text_content = self._generate_meeting_summary_text(
-                user_name, meeting_data, timeline_data, tasks_data
-            )
-
-            # Attach both HTML and text versions
-            text_part = MIMEText(text_content, 'plain')
-            html_part = MIMEText(html_content, 'html')
-            
-            msg.attach(text_part)
-            msg.attach(html_part)
+            # Generate plain text content (optional; most clients only show the HTML)
+            if self.include_plaintext:
+                text_content = self._generate_meeting_summary_text(
+                    user_name, meeting_data, timeline_data, tasks_data
+                )
+                msg.set_content(text_content)
+                # HTML goes last so it is the preferred alternative
+                msg.add_alternative(html_content, subtype='html')
+            else:
+                msg.set_content(html_content, subtype='html')
 
             # Send email
             return self._send_email(msg)
@@ -75,6 +189,18 @@ class EmailService:
             logger.error(f"Failed to send meeting summary email: {str(e)}")
             return False
 
+    def send_meeting_summary_email_async(self,
+                                         user_email: str,
+                                         user_name: str,
+                                         meeting_data: Dict[str, Any],
+                                         timeline_data: List[Dict[str, Any]],
+                                         tasks_data: List[Dict[str, Any]]) -> Future:
+        """
+        Queue a meeting summary email; the returned future resolves to the send result
+        """
+        return self._executor.submit(self.send_meeting_summary_email, user_email, user_name,
+                                     meeting_data, timeline_data, tasks_data)
+
     def send_task_reminder_email(self, 
                                user_email: str, 
                                user_name: str,
@@ -87,51 +213,93 @@ class EmailService:
             return False
 
         try:
-            # Create email message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"Task Reminders - {len(tasks)} pending tasks"
-            msg['From'] = f"{self.from_name} <{self.email_address}>"
-            msg['To'] = user_email
-
-            # Generate content
-            html_content = self._generate_task_reminder_html(user_name, tasks)
-            text_content = self._generate_task_reminder_text(user_name, tasks)
-
-            # Attach both versions
-            text_part = MIMEText(text_content, 'plain')
-            html_part = MIMEText(html_content, 'html')
-            
-            msg.attach(text_part)
-            msg.attach(html_part)
-
-            # Send email
-            return self._send_email(msg)
+            return self._send_email(self._build_task_reminder_message(user_email, user_name, tasks))
 
         except Exception as e:
             logger.error(f"Failed to send task reminder email: {str(e)}")
             return False
 
-    def _send_email(self, msg: MIMEMultipart) -> bool:
+    def _build_task_reminder_message(self,
+                                     user_email: str,
+                                     user_name: str,
+                                     tasks: List[Dict[str, Any]]) -> EmailMessage:
+        """Build the task reminder MIME message for one recipient"""
+        # Create email message
+        msg = EmailMessage(policy=_EMAIL_POLICY)
+        msg['Subject'] = f"Task Reminders - {len(tasks)} pending tasks"
+        msg['From'] = f"{self.from_name} <{self.email_address}>"
+        msg['To'] = user_email
+
+        # Generate content
+        html_content = self._generate_task_reminder_html(user_name, tasks)
+        if self.include_plaintext:
+            text_content = self._generate_task_reminder_text(user_name, tasks)
+            msg.set_content(text_content)
+            msg.add_alternative(html_content, subtype='html')
+        else:
+            msg.set_content(html_content, subtype='html')
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls(context=_SSL_CTX)  # Enable TLS encryption
+        server.login(self.email_address, self.email_password)
+        if server.sock.session is not None:
+            _SSL_CTX.last_session = server.sock.session
+        return server
+
+    def _get_connection(self, slot: '_PooledSMTP') -> smtplib.SMTP:
+        """Return the slot's SMTP session, reconnecting if it is stale or due for rotation"""
+        if slot.server is not None and slot.sent >= self.max_messages_per_connection:
+            slot.close()
+        if slot.server is not None:
+            try:
+                if slot.server.noop()[0] != 250:
+                    slot.close()
+            except smtplib.SMTPException:
+                slot.close()
+        if slot.server is None:
+            slot.server = self._connect()
+        return slot.server
+
+    def _send_email(self, msg: EmailMessage) -> bool:
         """
-        Send email using SMTP
+        Send email over a pooled SMTP session
         """
         try:
-            # Create SMTP session
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()  # Enable TLS encryption
-            server.login(self.email_address, self.email_password)
-            
-            # Send email
-            text = msg.as_string()
-            server.sendmail(self.email_address, msg['To'], text)
-            server.quit()
+            # Serialized straight to wire-ready CRLF bytes (no str copy + re-encode)
+            payload = msg.as_bytes()
+        except Exception as e:
+            logger.error(f"Failed to send email: {str(e)}")
+            return False
+        to_addr = msg['To']
+
+        slot = self._pool.get()
+        try:
+            try:
+                self._get_connection(slot).sendmail(self.email_address, to_addr, payload)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the liveness check and the send; retry once
+                slot.close()
+                self._get_connection(slot).sendmail(self.email_address, to_addr, payload)
+            slot.sent += 1
             
-            logger.info(f"Email sent successfully to {msg['To']}")
+            logger.info(f"Email sent successfully to {to_addr}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to send email: {str(e)}")
+            slot.close()
             return False
+        finally:
+            self._pool.put(slot)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting sends, optionally drain queued ones, and close pooled sessions"""
+        self._executor.shutdown(wait=wait)
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
 
     def _generate_meeting_summary_html(self, 
                                      user_name: str,
@@ -141,128 +309,16 @@ class EmailService:
         """
         Generate HTML email content for meeting summary
         """
-        html_template = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Meeting Summary</title>
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px; }
-        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px; text-align: center; margin-bottom: 30px; }
-        .section { background: #f8f9fa; padding: 25px; margin-bottom: 25px; border-radius: 8px; border-left: 4px solid #667eea; }
-        .section h2 { color: #667eea; margin-top: 0; font-size: 1.4em; }
-        .timeline-item { background: white; padding: 15px; margin-bottom: 15px; border-radius: 6px; border-left: 3px solid #28a745; }
-        .timeline-time { font-weight: bold; color: #28a745; font-size: 0.9em; }
-        .timeline-title { font-weight: bold; margin: 5px 0; color: #333; }
-        .timeline-content { color: #666; }
-        .task-item { background: white; padding: 15px; margin-bottom: 10px; border-radius: 6px; border-left: 3px solid #ffc107; }
-        .task-priority { display: inline-block; padding: 3px 8px; border-radius: 12px; font-size: 0.8em; font-weight: bold; }
-        .priority-high { background: #dc3545; color: white; }
-        .priority-medium { background: #ffc107; color: #333; }
-        .priority-low { background: #28a745; color: white; }
-        .task-status { display: inline-block; padding: 3px 8px; border-radius: 12px; font-size: 0.8em; margin-left: 10px; }
-        .status-pending { background: #6c757d; color: white; }
-        .status-in_progress { background: #007bff; color: white; }
-        .status-completed { background: #28a745; color: white; }
-        .meeting-info { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
-        .info-card { background: white; padding: 15px; border-radius: 6px; text-align: center; }
-        .info-number { font-size: 2em; font-weight: bold; color: #667eea; }
-        .info-label { color: #666; font-size: 0.9em; }
-        .footer { text-align: center; margin-top: 40px; padding: 20px; color: #666; font-size: 0.9em; }
-        .participants { color: #666; font-size: 0.9em; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🤖 AI Meeting Assistant</h1>
-        <h2>Meeting Summary Report</h2>
-        <p>Hello {{ user_name }}! Here's your comprehensive meeting summary.</p>
-    </div>
-
-    <div class="section">
-        <h2>📋 Meeting Overview</h2>
-        <h3>{{ meeting_title }}</h3>
-        <div class="meeting-info">
-            <div class="info-card">
-                <div class="info-number">{{ duration_minutes }}</div>
-                <div class="info-label">Minutes</div>
-            </div>
-            <div class="info-card">
-                <div class="info-number">{{ timeline_count }}</div>
-                <div class="info-label">Timeline Events</div>
-            </div>
-            <div class="info-card">
-                <div class="info-number">{{ task_count }}</div>
-                <div class="info-label">Tasks Created</div>
-            </div>
-        </div>
-        <p><strong>Date:</strong> {{ meeting_date }}</p>
-        <p><strong>Status:</strong> <span style="color: #28a745;">✅ Processed Successfully</span></p>
-    </div>
-
-    {% if timeline_data %}
-    <div class="section">
-        <h2>⏰ Minute-by-Minute Timeline</h2>
-        {% for item in timeline_data %}
-        <div class="timeline-item">
-            <div class="timeline-time">{{ item.timestamp }} ({{ item.timestamp_minutes }} min)</div>
-            <div class="timeline-title">{{ item.title }}</div>
-            <div class="timeline-content">{{ item.content }}</div>
-            {% if item.participants %}
-            <div class="participants">👥 Participants: {{ item.participants | join(', ') }}</div>
-            {% endif %}
-        </div>
-        {% endfor %}
-    </div>
-    {% endif %}
-
-    {% if tasks_data %}
-    <div class="section">
-        <h2>✅ Action Items & Tasks</h2>
-        {% for task in tasks_data %}
-        <div class="task-item">
-            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                <strong>{{ task.title }}</strong>
-                <div>
-                    <span class="task-priority priority-{{ task.priority }}">{{ task.priority | upper }}</span>
-                    <span class="task-status status-{{ task.status }}">{{ task.status | replace('_', ' ') | title }}</span>
-                </div>
-            </div>
-            {% if task.description %}
-            <p>{{ task.description }}</p>
-            {% endif %}
-            {% if task.assigned_to %}
-            <p><strong>Assigned to:</strong> {{ task.assigned_to }}</p>
-            {% endif %}
-            {% if task.deadline %}
-            <p><strong>Deadline:</strong> {{ task.deadline }}</p>
-            {% endif %}
-        </div>
-        {% endfor %}
-    </div>
-    {% endif %}
-
-    <div class="footer">
-        <p>This summary was automatically generated by AI Meeting Assistant</p>
-        <p>📧 You're receiving this because you have email notifications enabled</p>
-        <p>🔧 Manage your notification preferences in Settings</p>
-    </div>
-</body>
-</html>
-        """
-
-        template = Template(html_template)
-        return template.render(
+        return _MEETING_SUMMARY_TMPL.render(
             user_name=user_name,
             meeting_title=meeting_data.get('title', 'Untitled Meeting'),
-            meeting_date=meeting_data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M')),
+            meeting_date=meeting_data.get('created_at') or _now_minute_label(),
             duration_minutes=meeting_data.get('duration', 0),
             timeline_count=len(timeline_data),
             task_count=len(tasks_data),
             timeline_data=timeline_data,
-            tasks_data=tasks_data
+            tasks_data=tasks_data,
+            task_badges=_TASK_BADGES
         )
 
     def _generate_meeting_summary_text(self, 
@@ -273,7 +329,7 @@ class EmailService:
         """
         Generate plain text email content for meeting summary
         """
-        text_content = f"""
+        parts = [f"""
 AI MEETING ASSISTANT - MEETING SUMMARY
 =====================================
 
@@ -284,71 +340,81 @@ Here's your comprehensive meeting summary:
 MEETING OVERVIEW
 ---------------
 Title: {meeting_data.get('title', 'Untitled Meeting')}
-Date: {meeting_data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M'))}
+Date: {meeting_data.get('created_at') or _now_minute_label()}
 Duration: {meeting_data.get('duration', 0)} minutes
 Timeline Events: {len(timeline_data)}
 Tasks Created: {len(tasks_data)}
 Status: ✅ Processed Successfully
 
-"""
+"""]
+        append = parts.append
 
         if timeline_data:
-            text_content += "\nMINUTE-BY-MINUTE TIMELINE\n"
-            text_content += "========================\n\n"
+            append("\nMINUTE-BY-MINUTE TIMELINE\n========================\n\n")
             for item in timeline_data:
-                text_content += f"⏰ {item.get('timestamp', '')} ({item.get('timestamp_minutes', 0)} min)\n"
-                text_content += f"📋 {item.get('title', '')}\n"
-                text_content += f"💬 {item.get('content', '')}\n"
+                append(f"⏰ {item.get('timestamp', '')} ({item.get('timestamp_minutes', 0)} min)\n"
+                       f"📋 {item.get('title', '')}\n"
+                       f"💬 {item.get('content', '')}\n")
                 if item.get('participants'):
-                    text_content += f"👥 Participants: {', '.join(item['participants'])}\n"
-                text_content += "\n" + "-" * 50 + "\n\n"
+                    append(f"👥 Participants: {', '.join(item['participants'])}\n")
+                append(_TIMELINE_ITEM_RULE)
 
         if tasks_data:
-            text_content += "\nACTION ITEMS & TASKS\n"
-            text_content += "===================\n\n"
+            append("\nACTION ITEMS & TASKS\n===================\n\n")
             for task in tasks_data:
-                text_content += f"✅ {task.get('title', '')}\n"
-                text_content += f"   Priority: {task.get('priority', 'medium').upper()}\n"
-                text_content += f"   Status: {task.get('status', 'pending').replace('_', ' ').title()}\n"
+                append(f"✅ {task.get('title', '')}\n"
+                       f"   Priority: {task.get('priority', 'medium').upper()}\n"
+                       f"   Status: {task.get('status', 'pending').replace('_', ' ').title()}\n")
                 if task.get('description'):
-                    text_content += f"   Description: {task['description']}\n"
+                    append(f"   Description: {task['description']}\n")
                 if task.get('assigned_to'):
-                    text_content += f"   Assigned to: {task['assigned_to']}\n"
+                    append(f"   Assigned to: {task['assigned_to']}\n")
                 if task.get('deadline'):
-                    text_content += f"   Deadline: {task['deadline']}\n"
-                text_content += "\n"
+                    append(f"   Deadline: {task['deadline']}\n")
+                append("\n")
 
-        text_content += """
+        append("""
 ---
 This summary was automatically generated by AI Meeting Assistant
 📧 You're receiving this because you have email notifications enabled
 🔧 Manage your notification preferences in Settings
-"""
+""")
 
-        return text_content
+        return "".join(parts)
 
     def _generate_task_reminder_html(self, user_name: str, tasks: List[Dict[str, Any]]) -> str:
         """Generate HTML for task reminder email"""
         # Similar structure to meeting summary but focused on tasks
         # Implementation would be similar to above
-        return f"<h1>Task Reminders for {user_name}</h1><!-- Task reminder HTML -->"
+        return _TASK_REMINDER_TMPL.render(user_name=user_name)
 
     def _generate_task_reminder_text(self, user_name: str, tasks: List[Dict[str, Any]]) -> str:
         """Generate plain text for task reminder email"""
         return f"Task Reminders for {user_name}\n\n<!-- Task reminder text -->"
 
-    def get_email_health(self) -> Dict[str, Any]:
+    def get_email_health(self, mode: str = 'deep') -> Dict[str, Any]:
         """
         Check email service health
+        mode='deep' also checks the SMTP server accepts TCP connections
         """
-        return {
+        health = {
             'service': 'email_service',
             'status': 'healthy' if self.enabled else 'disabled',
+            'mode': mode,
             'smtp_server': self.smtp_server,
             'smtp_port': self.smtp_port,
             'email_configured': bool(self.email_address),
             'from_name': self.from_name
         }
+        
+        if self.enabled and mode == 'deep':
+            probe = check_tcp_liveness(self.smtp_server, self.smtp_port, timeout=3.0)
+            health.update(probe)
+            if not probe['reachable']:
+                health['status'] = 'unhealthy'
+        
+        return health
 
 # Create global email service instance
 email_service = EmailService()
+atexit.register(email_service.shutdown)
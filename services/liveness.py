@@ -0,0 +1,24 @@
+"""
+Cheap liveness probes for external services
+Used by the frequently polled health endpoint instead of full API round-trips
+"""
+
+import socket
+import time
+from typing import Dict
+
+def check_tcp_liveness(host: str, port: int, timeout: float = 1.0) -> Dict:
+    """Open and immediately close a TCP connection to host:port"""
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+        return {
+            'reachable': True,
+            'response_time': round(time.perf_counter() - start, 4)
+        }
+    except OSError as e:
+        return {
+            'reachable': False,
+            'error': str(e)
+        }
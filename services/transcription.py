@@ -1,9 +1,16 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
 import os
 import time
-import urllib.parse
 from typing import Dict, Optional
 
+from services.liveness import check_tcp_liveness
+
+logger = logging.getLogger(__name__)
+
 class TranscriptionService:
     def __init__(self):
         self.api_key = os.getenv('RAPIDAPI_KEY')
@@ -11,12 +18,31 @@ class TranscriptionService:
             raise ValueError("RAPIDAPI_KEY environment variable is required")
         
         # Using Speech-to-Text AI via RapidAPI
-        self.base_url = "https://speech-to-text-ai.p.rapidapi.com"
+        self.host = "speech-to-text-ai.p.rapidapi.com"
+        self.base_url = f"https://{self.host}"
         self.headers = {
             "x-rapidapi-key": self.api_key,
             "x-rapidapi-host": "speech-to-text-ai.p.rapidapi.com",
             "Content-Type": "application/x-www-form-urlencoded"
         }
+        
+        # Endpoint and fixed query parameters are built once; requests encodes the
+        # per-call audio URL via params=
+        self._transcribe_endpoint = f"{self.base_url}/transcribe"
+        self._default_params = {'lang': 'en', 'task': 'transcribe'}
+        
+        # One keep-alive session so calls reuse the TCP+TLS connection to the API.
+        # Only failures to connect are retried: a POST that reached the API (read
+        # error or 5xx) may already be transcribing and billed, so it is not resent
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, other=0,
+                              backoff_factor=0.3, status_forcelist=(), raise_on_status=False)
+        )
+        self._session.mount('https://', adapter)
     
     def transcribe_audio(self, audio_url: str) -> Dict:
         """
@@ -24,34 +50,29 @@ class TranscriptionService:
         Returns: Dictionary with transcript and metadata
         """
         try:
-            print(f"🎵 Starting transcription for: {audio_url}")
-            
-            # Prepare the request URL with parameters
-            # URL encode the audio URL parameter
-            encoded_url = urllib.parse.quote(audio_url, safe='')
+            logger.debug("🎵 Starting transcription for: %s", audio_url)
             
             # Make direct transcription request (this service returns results immediately)
-            transcribe_url = f"{self.base_url}/transcribe?url={encoded_url}&lang=en&task=transcribe"
-            
-            response = requests.post(
-                transcribe_url,
-                headers=self.headers,
-                data=""  # Empty payload as required by the service
+            response = self._session.post(
+                self._transcribe_endpoint,
+                params={'url': audio_url, **self._default_params},
+                data="",  # Empty payload as required by the service
+                timeout=(5, 120)
             )
             
-            print(f"📊 Transcription response status: {response.status_code}")
+            logger.debug("📊 Transcription response status: %s", response.status_code)
             
             if response.status_code != 200:
                 error_text = response.text
-                print(f"❌ Transcription failed: {error_text}")
+                logger.error("❌ Transcription failed: %s", error_text)
                 return {
                     'success': False,
                     'error': f'Failed to submit transcription: {error_text}'
                 }
             
             # Parse the response
-            result = response.json()
-            print(f"✅ Transcription completed successfully")
+            result = orjson.loads(response.content)
+            logger.debug("✅ Transcription completed successfully")
             
             # Extract transcript text from the response
             # The exact format may vary, so we'll handle different possible structures
@@ -83,7 +104,7 @@ class TranscriptionService:
             }
             
         except Exception as e:
-            print(f"❌ Transcription service error: {str(e)}")
+            logger.error("❌ Transcription service error: %s", e, exc_info=True)
             return {
                 'success': False,
                 'error': f'Transcription service error: {str(e)}'
@@ -93,17 +114,30 @@ class TranscriptionService:
         """Extract speaker information from utterances (not used in this service)"""
         return {}
     
-    def get_transcription_health(self) -> Dict:
-        """Check if transcription service is healthy"""
+    def get_transcription_health(self, mode: str = 'deep') -> Dict:
+        """
+        Check if transcription service is healthy
+        mode='liveness' only checks the API host is reachable; 'deep' runs a real transcription
+        """
+        if mode == 'liveness':
+            probe = check_tcp_liveness(self.host, 443)
+            return {
+                'service': 'transcription',
+                'status': 'healthy' if probe['reachable'] else 'unhealthy',
+                'mode': mode,
+                **probe,
+                'api_key_configured': bool(self.api_key),
+                'service_url': self.base_url
+            }
+        
         try:
             # Test API connectivity with a simple request
             # We'll use a test URL to check if the service responds
             test_url = "https://cdn.openai.com/whisper/draft-20220913a/micro-machines.wav"
-            encoded_test_url = urllib.parse.quote(test_url, safe='')
             
-            response = requests.post(
-                f"{self.base_url}/transcribe?url={encoded_test_url}&lang=en&task=transcribe",
-                headers=self.headers,
+            response = self._session.post(
+                self._transcribe_endpoint,
+                params={'url': test_url, **self._default_params},
                 data="",
                 timeout=30  # Longer timeout for actual transcription test
             )
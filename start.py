@@ -4,14 +4,10 @@ Startup script for AI Meeting Assistant Backend
 """
 import os
 import sys
-from app import create_app
 
 def main():
-    """Start the Flask application"""
+    """Start the Flask application (Gunicorn in production, Werkzeug reloader in development)"""
     try:
-        # Create the Flask app
-        app = create_app()
-        
         # Get configuration from environment
         port = int(os.environ.get('PORT', 5000))
         debug_mode = os.environ.get('FLASK_ENV') == 'development'
@@ -24,7 +20,25 @@ def main():
         print(f"🌐 Health Check: http://{host}:{port}/api/health")
         print(f"📚 API Documentation: http://{host}:{port}/")
         
-        # Start the server
+        if not debug_mode:
+            # Replace this process with Gunicorn: several worker processes for the CPU
+            # phases, several threads per worker for the blocking SMTP/HTTP/DB I/O.
+            # No -w: Gunicorn reads the worker count from WEB_CONCURRENCY (set in the
+            # Dockerfile). Each worker has its own DB and SMTP pools, so totals scale with it
+            os.execvp('gunicorn', [
+                'gunicorn',
+                '-k', 'gthread', '--threads', os.environ.get('GUNICORN_THREADS', '8'),
+                '--timeout', os.environ.get('GUNICORN_TIMEOUT', '120'),
+                '-b', f'{host}:{port}',
+                'app:app',
+            ])
+        
+        # Development: Werkzeug server with the debugger and hot reload.
+        # For multi-process profiling without the GIL, run
+        # `gunicorn -w N -k gthread --reload app:app` instead: Werkzeug's fork-per-request
+        # mode would share the parent's DB pool sockets and log queue with each child
+        from app import create_app
+        app = create_app()
         app.run(
             debug=debug_mode,
             host=host,
@@ -4,7 +4,9 @@ Test script to verify Firebase UID handling
 """
 
 import requests
-import json
+import orjson
+
+from _client import session
 
 def test_firebase_uid():
     """Test with a real Firebase UID format"""
@@ -22,14 +24,14 @@ def test_firebase_uid():
     
     try:
         print(f"\nTesting API call with Firebase UID...")
-        response = requests.get(base_url, params={'user_id': firebase_uid}, timeout=10)
+        response = session.get(base_url, params={'user_id': firebase_uid}, timeout=10)
         
         print(f"Status Code: {response.status_code}")
         
         try:
-            response_data = response.json()
-            print(f"Response: {json.dumps(response_data, indent=2)}")
-        except json.JSONDecodeError:
+            response_data = orjson.loads(response.content)
+            print(f"Response: {orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()}")
+        except orjson.JSONDecodeError:
             print(f"Response (raw): {response.text}")
             
     except requests.exceptions.ConnectionError:
@@ -2,16 +2,17 @@
 """
 Simple test script to verify health endpoint works
 """
-import requests
-import json
+import orjson
+
+from _client import session
 
 def test_health_endpoint():
     """Test the health endpoint"""
     try:
         # Test health endpoint
-        response = requests.get('http://localhost:5000/api/health')
+        response = session.get('http://localhost:5000/api/health')
         print(f"Health endpoint status: {response.status_code}")
-        print(f"Health endpoint response: {response.json()}")
+        print(f"Health endpoint response: {orjson.loads(response.content)}")
         
         if response.status_code == 200:
             print("✅ Health endpoint is working correctly")
@@ -26,9 +27,9 @@ def test_notifications_endpoint():
     try:
         # Test with a dummy Firebase UID
         test_uid = "test_firebase_uid_123"
-        response = requests.get(f'http://localhost:5000/api/auth/user/{test_uid}/notifications')
+        response = session.get(f'http://localhost:5000/api/auth/user/{test_uid}/notifications')
         print(f"Notifications endpoint status: {response.status_code}")
-        print(f"Notifications endpoint response: {response.json()}")
+        print(f"Notifications endpoint response: {orjson.loads(response.content)}")
         
         if response.status_code == 200:
             print("✅ Notifications endpoint is working correctly")
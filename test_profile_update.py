@@ -3,8 +3,9 @@
 Test script to verify profile update functionality
 """
 
-import requests
-import json
+import orjson
+
+from _client import session
 
 def test_profile_update():
     base_url = "http://localhost:5000"
@@ -16,7 +17,7 @@ def test_profile_update():
     
     # Step 1: Create a test user
     print("\n1. Creating test user...")
-    create_response = requests.post(f"{base_url}/api/auth/verify", json={
+    create_response = session.post(f"{base_url}/api/auth/verify", json={
         "firebase_uid": test_firebase_uid,
         "email": "test@example.com",
         "name": "Original Name"
@@ -24,7 +25,7 @@ def test_profile_update():
     
     print(f"   Status: {create_response.status_code}")
     if create_response.status_code == 200:
-        user_data = create_response.json()
+        user_data = orjson.loads(create_response.content)
         print(f"   Created user: {user_data['user']['name']}")
     else:
         print(f"   Error: {create_response.text}")
@@ -32,13 +33,13 @@ def test_profile_update():
     
     # Step 2: Update the user's name
     print("\n2. Updating user name...")
-    update_response = requests.put(f"{base_url}/api/auth/user/{test_firebase_uid}", json={
+    update_response = session.put(f"{base_url}/api/auth/user/{test_firebase_uid}", json={
         "name": "Updated Name"
     })
     
     print(f"   Status: {update_response.status_code}")
     if update_response.status_code == 200:
-        updated_data = update_response.json()
+        updated_data = orjson.loads(update_response.content)
         print(f"   Updated user: {updated_data['user']['name']}")
     else:
         print(f"   Error: {update_response.text}")
@@ -46,11 +47,11 @@ def test_profile_update():
     
     # Step 3: Verify the update by fetching user data
     print("\n3. Verifying update...")
-    get_response = requests.get(f"{base_url}/api/auth/user/{test_firebase_uid}")
+    get_response = session.get(f"{base_url}/api/auth/user/{test_firebase_uid}")
     
     print(f"   Status: {get_response.status_code}")
     if get_response.status_code == 200:
-        fetched_data = get_response.json()
+        fetched_data = orjson.loads(get_response.content)
         print(f"   Fetched user: {fetched_data['user']['name']}")
         
         if fetched_data['user']['name'] == "Updated Name":
@@ -62,7 +63,7 @@ def test_profile_update():
     
     # Step 4: Clean up - delete test user
     print("\n4. Cleaning up...")
-    delete_response = requests.delete(f"{base_url}/api/auth/user/{test_firebase_uid}", json={
+    delete_response = session.delete(f"{base_url}/api/auth/user/{test_firebase_uid}", json={
         "confirmation": "DELETE_MY_ACCOUNT"
     })
     
@@ -4,9 +4,11 @@ Test script for the tasks API endpoint
 """
 
 import requests
-import json
+import orjson
 from datetime import datetime
 
+from _client import session
+
 def test_tasks_api():
     """Test the /api/tasks endpoint"""
     
@@ -44,7 +46,7 @@ def test_tasks_api():
         print(f"   Params: {test_case['params']}")
         
         try:
-            response = requests.get(base_url, params=test_case['params'], timeout=10)
+            response = session.get(base_url, params=test_case['params'], timeout=10)
             
             print(f"   Status Code: {response.status_code}")
             print(f"   Expected: {test_case['expected_status']}")
@@ -56,9 +58,9 @@ def test_tasks_api():
             
             # Try to parse JSON response
             try:
-                response_data = response.json()
-                print(f"   Response: {json.dumps(response_data, indent=2)}")
-            except json.JSONDecodeError:
+                response_data = orjson.loads(response.content)
+                print(f"   Response: {orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()}")
+            except orjson.JSONDecodeError:
                 print(f"   Response (raw): {response.text}")
                 
         except requests.exceptions.ConnectionError: